@@ -0,0 +1,101 @@
+"""Bank/network coverage as bitmasks.
+
+Every bank or card network named in a product's banks_supported is interned
+to a bit ("HDFC Bank" and "HDFC" share one), so each product's coverage is a
+single int. "Covers all of these banks", "covers only these" and "covers at
+least n" are then a bitwise AND/compare or a popcount.
+
+coverage_matrix() does the same for many merchant bank sets at once with
+NumPy (imported lazily): masks are packed into uint64 words and the result is
+a merchants x products boolean matrix.
+"""
+import re
+
+
+def canonical_bank(name):
+    """Fold a bank label to its interned key ("HDFC Bank" -> "hdfc")."""
+    key = re.sub(r"[^0-9a-z]+", "", name.casefold())
+    if key.endswith("bank") and key != "bank":
+        key = key[:-4]
+    return key
+
+
+class BankIndex:
+    __slots__ = ("ids", "names", "products", "masks")
+
+    def __init__(self, products):
+        self.ids = {}
+        self.names = []
+        self.products = tuple(products)
+        self.masks = {}
+        for name, details in products.items():
+            mask = 0
+            for bank in details.get("banks_supported", []):
+                key = canonical_bank(bank)
+                if key not in self.ids:
+                    self.ids[key] = len(self.names)
+                    self.names.append(bank)
+                mask |= 1 << self.ids[key]
+            self.masks[name] = mask
+        self.names = tuple(self.names)
+
+    def mask(self, banks):
+        """Bitmask for bank labels; an unknown bank maps to a bit no product has."""
+        mask = 0
+        for bank in banks:
+            mask |= 1 << self.ids.get(canonical_bank(bank), len(self.names))
+        return mask
+
+    def banks_of(self, mask):
+        return [name for i, name in enumerate(self.names) if mask >> i & 1]
+
+    def covering_all(self, banks):
+        """Products supporting every bank in banks (required is a subset of coverage)."""
+        required = self.mask(banks)
+        return {p for p, m in self.masks.items() if m & required == required}
+
+    def covered_by(self, banks):
+        """Products supporting nothing outside banks (coverage is a subset of allowed)."""
+        allowed = self.mask(banks)
+        return {p for p, m in self.masks.items() if m & ~allowed == 0}
+
+    def covering_at_least(self, banks, n):
+        """Products supporting at least n of banks."""
+        required = self.mask(banks)
+        return {p for p, m in self.masks.items() if (m & required).bit_count() >= n}
+
+    def covers(self, product, required, min_banks=None):
+        """Whether product satisfies a mask from mask(): all of it, or at least min_banks bits."""
+        shared = self.masks[product] & required
+        return shared == required if min_banks is None else shared.bit_count() >= min_banks
+
+    def matching(self, banks, min_banks=None):
+        return self.covering_all(banks) if min_banks is None else self.covering_at_least(banks, min_banks)
+
+    def _words(self, masks, np):
+        # +1 bit for the "unknown bank" sentinel
+        n_words = (len(self.names) + 1 + 63) // 64
+        out = np.zeros((len(masks), n_words), dtype=np.uint64)
+        for i, mask in enumerate(masks):
+            for w in range(n_words):
+                out[i, w] = (mask >> (64 * w)) & 0xFFFFFFFFFFFFFFFF
+        return out
+
+    def coverage_matrix(self, bank_sets, min_banks=None):
+        """(merchants x products) bool: does each product satisfy each merchant's banks.
+
+        Same rule as matching(): all banks when min_banks is None, else at
+        least min_banks of them. Columns follow self.products.
+        """
+        import numpy as np
+
+        merchants = self._words([self.mask(banks) for banks in bank_sets], np)[:, None, :]
+        products = self._words([self.masks[p] for p in self.products], np)[None, :, :]
+        shared = merchants & products
+        if min_banks is None:
+            return (shared == merchants).all(axis=2)
+        if hasattr(np, "bitwise_count"):
+            counts = np.bitwise_count(shared).sum(axis=2, dtype=np.int64)
+        else:
+            counts = np.unpackbits(shared.view(np.uint8), axis=2).sum(axis=2, dtype=np.int64)
+        return counts >= min_banks
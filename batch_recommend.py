@@ -0,0 +1,245 @@
+"""Headless batch recommendations for a merchant CSV.
+
+    python batch_recommend.py merchants.csv -o recs.jsonl
+    python batch_recommend.py merchants.csv -o recs.parquet --format parquet --workers 8
+
+The input needs merchant_id and industry columns; banks and flags are optional
+and hold ";"- or "|"-separated lists. Rows are streamed in fixed-size chunks
+and at most two chunks per worker are in flight, so memory stays flat however
+large the input is. Each worker compiles every distinct industry once.
+
+With --top-k K each merchant also gets its K best catalog entries from the
+scoring engine (scoring.py), using its flags as feature preferences; a chunk
+is scored in one vectorized call. --require-banks drops products that do not
+support all of a merchant's banks (or --min-banks of them), from both the
+journey and the top-k ranking; the distinct bank sets of a chunk are checked
+against the catalog in one vectorized call.
+"""
+import argparse
+import csv
+import functools
+import json
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from recommender_core import canonical_industry, default_catalog, recommend
+
+_LIST_SEP = re.compile(r"[;|]")
+
+
+def _split(value):
+    return tuple(part.strip() for part in _LIST_SEP.split(value or "") if part.strip())
+
+
+def _read_rows(stream):
+    reader = csv.DictReader(stream)
+    missing = {"merchant_id", "industry"} - set(reader.fieldnames or ())
+    if missing:
+        raise SystemExit(f"input is missing column(s): {', '.join(sorted(missing))}")
+    for row in reader:
+        yield row["merchant_id"], row["industry"], _split(row.get("banks")), _split(row.get("flags"))
+
+
+def _chunks(rows, size):
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+@functools.lru_cache(maxsize=4096)
+def _journey(industry_key, allowed=None):
+    rows = recommend(industry_key)
+    if allowed is not None:
+        products = default_catalog().products
+        rows = [r for r in rows if r.product in allowed or r.product not in products]
+    products = [r.product for r in rows]
+    priorities = [r.priority for r in rows]
+    fragment = json.dumps(
+        [{"product": r.product, "category": r.category, "priority": r.priority} for r in rows],
+        ensure_ascii=False,
+    )
+    return products, priorities, fragment
+
+
+def _rank_chunk(chunk, k, allowed=None):
+    """Top-k entry names per merchant; products outside allowed[banks] are left out."""
+    import numpy as np
+
+    from scoring import scoring_model
+
+    catalog = default_catalog()
+    model = scoring_model(catalog)
+    weights = model.preference_matrix([dict.fromkeys(flags, 1.0) for _, _, _, flags in chunk])
+    exclude = None
+    if allowed:
+        # Same rule as the journeys: products need the banks, add-ons never do
+        is_product = np.array([name in catalog.products for name in model.entries])
+        blocked = {
+            banks: is_product & ~np.array([name in ok for name in model.entries])
+            for banks, ok in allowed.items()
+        }
+        exclude = np.zeros((len(chunk), len(model.entries)), dtype=bool)
+        for n, (_, _, banks, _) in enumerate(chunk):
+            row = blocked.get(banks)
+            if row is not None:
+                exclude[n] = row
+    indices, scores = model.top_k_batch([industry for _, industry, _, _ in chunk], weights, k, exclude=exclude)
+    return [
+        [model.entries[i] for i, score in zip(row, row_scores) if score != -np.inf]
+        for row, row_scores in zip(indices.tolist(), scores.tolist())
+    ]
+
+
+def _bank_filters(chunk, min_banks):
+    """Allowed products per distinct non-empty bank set in the chunk.
+
+    A merchant without banks has no entry (no filter), as in recommend().
+    """
+    coverage = default_catalog().coverage
+    bank_sets = list(dict.fromkeys(banks for _, _, banks, _ in chunk if banks))
+    if not bank_sets:
+        return {}
+    matrix = coverage.coverage_matrix(bank_sets, min_banks)
+    return {
+        banks: frozenset(p for p, ok in zip(coverage.products, row) if ok)
+        for banks, row in zip(bank_sets, matrix.tolist())
+    }
+
+
+def _recommend_chunk(chunk, fmt, top_k=0, require_banks=False, min_banks=None):
+    allowed = _bank_filters(chunk, min_banks) if require_banks else {}
+    ranked = _rank_chunk(chunk, top_k, allowed) if top_k else None
+    if fmt == "jsonl":
+        lines = []
+        for n, (merchant_id, industry, banks, flags) in enumerate(chunk):
+            fragment = _journey(canonical_industry(industry), allowed.get(banks))[2]
+            top = ', "top_k": %s' % json.dumps(ranked[n], ensure_ascii=False) if ranked else ""
+            lines.append(
+                '{"merchant_id": %s, "industry": %s, "banks": %s, "flags": %s, "recommendations": %s%s}\n'
+                % (
+                    json.dumps(merchant_id, ensure_ascii=False),
+                    json.dumps(industry, ensure_ascii=False),
+                    json.dumps(banks, ensure_ascii=False),
+                    json.dumps(flags, ensure_ascii=False),
+                    fragment,
+                    top,
+                )
+            )
+        return "".join(lines)
+
+    columns = {"merchant_id": [], "industry": [], "banks": [], "flags": [], "products": [], "priorities": []}
+    for merchant_id, industry, banks, flags in chunk:
+        products, priorities, _ = _journey(canonical_industry(industry), allowed.get(banks))
+        columns["merchant_id"].append(merchant_id)
+        columns["industry"].append(industry)
+        columns["banks"].append(list(banks))
+        columns["flags"].append(list(flags))
+        columns["products"].append(products)
+        columns["priorities"].append(priorities)
+    if ranked:
+        columns["top_k"] = ranked
+    return columns
+
+
+class _JsonlSink:
+    def __init__(self, path):
+        self.stream = sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+
+    def write(self, payload):
+        self.stream.write(payload)
+
+    def close(self):
+        if self.stream is not sys.stdout:
+            self.stream.close()
+
+
+class _ParquetSink:
+    def __init__(self, path, top_k=0):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("--format parquet needs pyarrow (pip install pyarrow)")
+        self.pa = pa
+        strings = pa.list_(pa.string())
+        self.schema = pa.schema([
+            ("merchant_id", pa.string()),
+            ("industry", pa.string()),
+            ("banks", strings),
+            ("flags", strings),
+            ("products", strings),
+            ("priorities", strings),
+        ] + ([("top_k", strings)] if top_k else []))
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, payload):
+        # One row group per chunk
+        self.writer.write_table(self.pa.Table.from_pydict(payload, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+def run(rows, sink, fmt="jsonl", workers=1, chunk_size=5000, top_k=0, require_banks=False, min_banks=None):
+    """Stream rows through the recommender into sink; returns the number of merchants."""
+    options = (fmt, top_k, require_banks, min_banks)
+    count = 0
+    if workers <= 1:
+        for chunk in _chunks(rows, chunk_size):
+            sink.write(_recommend_chunk(chunk, *options))
+            count += len(chunk)
+        return count
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in _chunks(rows, chunk_size):
+            pending.append((len(chunk), pool.submit(_recommend_chunk, chunk, *options)))
+            # Bounded in-flight work; results are written in input order
+            if len(pending) >= workers * 2:
+                size, future = pending.popleft()
+                sink.write(future.result())
+                count += size
+        while pending:
+            size, future = pending.popleft()
+            sink.write(future.result())
+            count += size
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recommend Juspay products for a CSV of merchants.")
+    parser.add_argument("input", help="merchant CSV, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output path (default: stdout, jsonl only)")
+    parser.add_argument("--format", choices=("jsonl", "parquet"), default="jsonl")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=5000, help="merchants per chunk / row group")
+    parser.add_argument("--top-k", type=int, default=0, help="also rank the K best entries using flags as preferences")
+    parser.add_argument("--require-banks", action="store_true", help="keep only products supporting the merchant's banks")
+    parser.add_argument("--min-banks", type=int, help="with --require-banks: at least N of the banks instead of all")
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet" and args.output == "-":
+        parser.error("--format parquet needs an --output path")
+
+    stream = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    sink = _ParquetSink(args.output, args.top_k) if args.format == "parquet" else _JsonlSink(args.output)
+    try:
+        count = run(
+            _read_rows(stream), sink, args.format, args.workers, args.chunk_size,
+            args.top_k, args.require_banks or args.min_banks is not None, args.min_banks,
+        )
+    finally:
+        sink.close()
+        if stream is not sys.stdin:
+            stream.close()
+    print(f"recommended {count} merchants", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
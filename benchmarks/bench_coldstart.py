@@ -0,0 +1,92 @@
+"""Import-time and first-render-time benchmark.
+
+    python benchmarks/bench_coldstart.py [--repeat 5]
+
+Every measurement runs in a fresh interpreter so nothing is already imported.
+It reports the cost of importing recommender_core against importing pandas,
+the time for each app's first journey render (Streamlit's AppTest harness),
+whether pandas got imported on that path, and the in-process cost of the
+record path against the old DataFrame + iterrows() path.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+IMPORT_SNIPPET = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - t, "pandas": "pandas" in sys.modules}}))
+"""
+
+RENDER_SNIPPET = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+t = time.perf_counter()
+at = AppTest.from_file({script!r}, default_timeout=60).run()
+at.selectbox[0].set_value("e-commerce").run()
+at.button[0].click().run()
+assert not at.exception, at.exception
+print(json.dumps({{"seconds": time.perf_counter() - t, "pandas": "pandas" in sys.modules}}))
+"""
+
+PATH_SNIPPET = """
+import json, timeit
+import pandas as pd
+from recommender_core import default_catalog, recommendations_frame
+catalog = default_catalog()
+
+def records():
+    for r in catalog.recommend("e-commerce"):
+        (r.product, r.priority, r.api_calls, r.banks_supported)
+
+def frame():
+    for _, r in recommendations_frame(catalog.recommend("e-commerce")).iterrows():
+        (r["Product"], r["Priority"], r["API Calls"], r["Banks Supported"])
+
+n = 200
+print(json.dumps({
+    "records_us": min(timeit.repeat(records, number=n, repeat=3)) / n * 1e6,
+    "dataframe_us": min(timeit.repeat(frame, number=n, repeat=3)) / n * 1e6,
+}))
+"""
+
+
+def fresh(snippet):
+    out = subprocess.run(
+        [sys.executable, "-c", snippet], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def measure(snippet, repeat):
+    runs = [fresh(snippet) for _ in range(repeat)]
+    return {"median_s": statistics.median(r["seconds"] for r in runs), "pandas": runs[0]["pandas"]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = {
+        "import recommender_core": measure(IMPORT_SNIPPET.format(module="recommender_core"), args.repeat),
+        "import pandas": measure(IMPORT_SNIPPET.format(module="pandas"), args.repeat),
+    }
+    for script in ("juspay_recommender.py", "product_recommender.py"):
+        results[f"first render {script}"] = measure(RENDER_SNIPPET.format(script=script), args.repeat)
+
+    for name, r in results.items():
+        print(f"{name:<40} {r['median_s'] * 1e3:>9.1f} ms   pandas imported: {r['pandas']}")
+    path = fresh(PATH_SNIPPET)
+    print(f"{'journey via records':<40} {path['records_us']:>9.1f} us")
+    print(f"{'journey via DataFrame.iterrows()':<40} {path['dataframe_us']:>9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Health feed throughput: parse + record events, and snapshot cost.
+
+    python benchmarks/bench_health.py --events 1000000
+
+The feed has to sustain 100k events/s on the ingest thread; snapshots are
+what the UI pays, at most once a second.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from health import HealthMonitor  # noqa: E402
+
+METHODS = ("UPI", "card", "NB")
+BANKS = ("HDFC Bank", "ICICI Bank", "SBI", "Axis Bank", "Kotak", "Yes Bank", "PNB", "Visa", "Mastercard", "RuPay")
+
+
+def synthetic_lines(n, rate=100_000, seed=3):
+    rng = random.Random(seed)
+    start = time.time() - n / rate
+    return [
+        f"{start + i / rate:.3f},{rng.choice(METHODS)},{rng.choice(BANKS)},{int(rng.random() < 0.95)},{rng.lognormvariate(6.5, 0.6):.0f}"
+        for i in range(n)
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=16384)
+    args = parser.parse_args(argv)
+
+    lines = synthetic_lines(args.events)
+    monitor = HealthMonitor()
+    start = time.perf_counter()
+    for i in range(0, len(lines), args.batch):
+        monitor.ingest(lines[i:i + args.batch])
+    elapsed = time.perf_counter() - start
+    print(f"ingest: {args.events} events in {elapsed:.2f}s = {args.events / elapsed:,.0f} events/s")
+
+    start = time.perf_counter()
+    snapshot = monitor.snapshot(now=time.time())
+    print(f"snapshot: {(time.perf_counter() - start) * 1e3:.2f} ms for {len(snapshot.pairs)} keys")
+    for method, health in sorted(snapshot.methods.items()):
+        print(f"  {method:<24} {health.events:>8} {health.success_rate:7.2%}  p50 {health.p50_ms:7.0f} ms  p99 {health.p99_ms:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
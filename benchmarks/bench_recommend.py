@@ -0,0 +1,67 @@
+"""Compare the old linear-scan recommend() with the compiled index.
+
+    python benchmarks/bench_recommend.py
+
+The scan cost grows with the catalog; the index lookup should stay flat.
+"""
+import random
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from recommender_core import build_index  # noqa: E402
+
+INDUSTRIES = [f"Industry {i}" for i in range(40)]
+
+
+def synthetic_catalog(n_products, n_addons=8, seed=7):
+    rng = random.Random(seed)
+    products = {}
+    for i in range(n_products):
+        picked = rng.sample(INDUSTRIES, 12)
+        products[f"Product {i}"] = {
+            "category": "Payments",
+            "why": "Synthetic product",
+            "api_calls": ["/session", "/status"],
+            "banks_supported": ["HDFC", "ICICI"],
+            "must_have": picked[:8],
+            "good_to_have": picked[8:],
+        }
+    addons = {
+        f"Add-on {i}": {"category": "Payment Suite V2", "why": "Synthetic add-on", "api_calls": ["/x"]}
+        for i in range(n_addons)
+    }
+    return products, addons
+
+
+def scan_recommend(products, addons, industry):
+    # The pre-index implementation, minus the DataFrame construction
+    recs = []
+    for name, details in products.items():
+        if industry in details.get("must_have", []) or industry in details.get("good_to_have", []):
+            recs.append({
+                "Product": name,
+                "Category": details.get("category", "General"),
+                "Priority": "Must Have" if industry in details.get("must_have", []) else "Good to Have",
+            })
+    for name, details in addons.items():
+        recs.append({"Product": name, "Category": details.get("category", "Add-on"), "Priority": "Add-on"})
+    return recs
+
+
+def main(sizes=(3, 100, 1_000, 10_000)):
+    print(f"{'products':>9} {'build ms':>10} {'scan us':>10} {'lookup us':>10}")
+    for n in sizes:
+        products, addons = synthetic_catalog(n)
+        build_s = min(timeit.repeat(lambda: build_index(products, addons), number=1, repeat=3))
+        index = build_index(products, addons)
+        number = max(1, 20_000 // n)
+        scan_s = min(timeit.repeat(lambda: scan_recommend(products, addons, "Industry 3"), number=number, repeat=3)) / number
+        lookup_s = min(timeit.repeat(lambda: index.lookup("Industry 3"), number=10_000, repeat=3)) / 10_000
+        print(f"{n:>9} {build_s * 1e3:>10.2f} {scan_s * 1e6:>10.1f} {lookup_s * 1e6:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Keep-alive load generator for recommender_service.py.
+
+    python benchmarks/loadgen_service.py --spawn --connections 2000 --rate 5000 --duration 10
+
+Opens --connections keep-alive connections and, across them, sends --rate
+requests per second (open loop: each connection fires on its own schedule, so
+latency is not hidden by back-pressure). Latency is measured from write to the
+last body byte. Exits non-zero when p99 is above --p99-budget-ms.
+
+With --rate 0 every connection sends back-to-back (closed loop) to find the
+throughput ceiling instead. Raise the open-file limit (ulimit -n) for large
+--connections.
+"""
+import argparse
+import asyncio
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from array import array
+from pathlib import Path
+from urllib.parse import quote
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PATHS = ["/industries", "/addons"] + [
+    "/recommendations/" + quote(name) for name in ("e-commerce", "Travel", "EdTech", "Hyperlocal", "Other")
+]
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def _read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = 0
+    etag = None
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        if name == b"content-length":
+            length = int(value)
+        elif name == b"etag":
+            etag = value.strip().decode()
+    if length:
+        await reader.readexactly(length)
+    return head[9:12], etag
+
+
+async def _connection(host, port, deadline, interval, args, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    rng = random.Random()
+    next_send = time.perf_counter() + (rng.random() * interval if interval else 0)
+    try:
+        while True:
+            if interval:
+                delay = next_send - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_send += interval
+            if time.perf_counter() >= deadline:
+                return
+            path = rng.choice(PATHS)
+            request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+            if args.gzip:
+                request += "Accept-Encoding: gzip\r\n"
+            if args.etag and path in etags:
+                request += f"If-None-Match: {etags[path]}\r\n"
+            start = time.perf_counter()
+            writer.write((request + "\r\n").encode())
+            status, etag = await _read_response(reader)
+            latencies.append((time.perf_counter() - start) * 1e3)
+            statuses[status] = statuses.get(status, 0) + 1
+            if etag:
+                etags[path] = etag
+    finally:
+        writer.close()
+
+
+async def _run(args):
+    deadline = time.perf_counter() + args.duration
+    interval = args.connections / args.rate if args.rate else 0
+    latencies = array("d")
+    statuses = {}
+    # Stagger connects so the accept backlog is not the thing being measured
+    tasks = []
+    for _ in range(args.connections):
+        tasks.append(asyncio.create_task(
+            _connection(args.host, args.port, deadline, interval, args, latencies, statuses)
+        ))
+        await asyncio.sleep(0)
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    errors = [r for r in results if isinstance(r, BaseException)]
+    return latencies, statuses, errors
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--spawn", action="store_true", help="start recommender_service.py on a free port")
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=2000, help="total requests/s (0 = closed loop)")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--gzip", action="store_true", help="send Accept-Encoding: gzip")
+    parser.add_argument("--etag", action="store_true", help="revalidate with If-None-Match (expect 304s)")
+    parser.add_argument("--p99-budget-ms", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn:
+        args.port = _free_port()
+        server = subprocess.Popen(
+            [sys.executable, str(ROOT / "recommender_service.py"), "--host", args.host, "--port", str(args.port)],
+            stdout=subprocess.PIPE,
+        )
+        server.stdout.readline()  # "serving catalog ..." once it is about to listen
+        time.sleep(0.3)
+    try:
+        latencies, statuses, errors = asyncio.run(_run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if not latencies:
+        raise SystemExit(f"no responses ({len(errors)} connection errors: {errors[:1]})")
+    values = sorted(latencies)
+    p99 = _percentile(values, 0.99)
+    print(f"requests   {len(values)} in {args.duration:.0f}s ({len(values) / args.duration:.0f}/s) "
+          f"over {args.connections} connections, {len(errors)} errors")
+    print(f"statuses   {', '.join(f'{k.decode()}: {v}' for k, v in sorted(statuses.items()))}")
+    print(f"latency ms mean {statistics.fmean(values):.3f}  p50 {_percentile(values, 0.5):.3f}  "
+          f"p99 {p99:.3f}  p99.9 {_percentile(values, 0.999):.3f}  max {values[-1]:.3f}")
+    if p99 > args.p99_budget_ms:
+        print(f"p99 {p99:.3f} ms is over the {args.p99_budget_ms} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""Reproducible benchmark suite with JSON results and a regression check.
+
+    python benchmarks/suite.py run [--quick] [--only micro,coldstart,render,load] [-o results.json]
+    python benchmarks/suite.py compare baseline.json results.json [--threshold 0.2]
+
+Parts:
+
+    micro      Catalog build and recommend() (with and without a bank filter)
+               on synthetic catalogs of 3 to 100k products (bench_recommend)
+    coldstart  fresh-interpreter import of recommender_core and streamlit, and
+               each app's first script run (bench_coldstart)
+    render     warm AppTest reruns per app: "Show My Journey", opening a card,
+               the next page and a catalog search
+    load       N simulated users, each clicking "Show My Journey" across
+               industries at the same time
+
+AppTest sessions share process-global state and cannot run concurrently in
+threads, so every simulated user in the load test is its own process. That
+measures contention for the machine's cores, not for one server's GIL.
+
+run writes {"meta": ..., "metrics": {name: {"value", "unit"}}} (all lower is
+better) to benchmarks/results/latest.json by default. Save one as the baseline
+on the machine that runs the comparisons. compare prints every shared metric
+and exits 1 when any is slower than the baseline by more than --threshold
+(a fraction) and by more than --min-delta-ms, so sub-microsecond jitter does
+not count. A baseline metric the current run lacks (or reports in another
+unit) is listed as MISSING and also fails the comparison.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_coldstart import IMPORT_SNIPPET, ROOT, measure  # noqa: E402
+from bench_recommend import INDUSTRIES, synthetic_catalog  # noqa: E402
+
+APPS = ("juspay_recommender.py", "product_recommender.py")
+PARTS = ("micro", "coldstart", "render", "load")
+DEFAULT_OUTPUT = ROOT / "benchmarks" / "results" / "latest.json"
+
+COLDSTART_SNIPPET = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+t = time.perf_counter()
+at = AppTest.from_file({script!r}, default_timeout=60).run()
+assert not at.exception, at.exception
+print(json.dumps({{"seconds": time.perf_counter() - t, "pandas": "pandas" in sys.modules}}))
+"""
+
+
+def _metric(metrics, name, value, unit):
+    metrics[name] = {"value": round(value, 6), "unit": unit}
+
+
+# -------------------------
+# micro
+# -------------------------
+def bench_micro(metrics, quick):
+    from recommender_core import Catalog
+
+    sizes = (3, 100, 1_000, 10_000) if quick else (3, 100, 1_000, 10_000, 100_000)
+    for n in sizes:
+        products, addons = synthetic_catalog(n)
+        for i, details in enumerate(products.values()):
+            details["banks_supported"] = ["HDFC", "ICICI", "SBI"][: 1 + i % 3]
+        start = time.perf_counter()
+        catalog = Catalog(products, addons, (), INDUSTRIES)
+        _metric(metrics, f"micro.build.n={n}", (time.perf_counter() - start) * 1e3, "ms")
+        number = 2_000 if quick else 10_000
+        for label, call in (
+            ("recommend", lambda: catalog.recommend("Industry 3")),
+            ("recommend_banks", lambda: catalog.recommend("Industry 3", banks=["HDFC", "ICICI"])),
+        ):
+            # Bank filtering is linear in the journey; fewer iterations on big catalogs
+            reps = number if label == "recommend" or n <= 1_000 else max(20, number * 1_000 // n)
+            best = min(timeit.repeat(call, number=reps, repeat=3)) / reps
+            _metric(metrics, f"micro.{label}.n={n}", best * 1e6, "us")
+
+
+# -------------------------
+# coldstart
+# -------------------------
+def bench_coldstart(metrics, quick):
+    repeat = 2 if quick else 5
+    for module in ("recommender_core", "streamlit"):
+        _metric(metrics, f"coldstart.import.{module}", measure(IMPORT_SNIPPET.format(module=module), repeat)["median_s"] * 1e3, "ms")
+    for script in APPS:
+        result = measure(COLDSTART_SNIPPET.format(script=script), repeat)
+        _metric(metrics, f"coldstart.first_run.{script}", result["median_s"] * 1e3, "ms")
+
+
+# -------------------------
+# render
+# -------------------------
+def _show_button(at):
+    return next(b for b in at.button if b.label.startswith("✨"))
+
+
+def _timed(action):
+    start = time.perf_counter()
+    action()
+    return (time.perf_counter() - start) * 1e3
+
+
+def _render_samples(script, rounds):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / script), default_timeout=60).run()
+    industries = at.selectbox[0].options
+    samples = {"show_journey": [], "toggle_card": [], "next_page": [], "search": []}
+    for i in range(rounds):
+        at.selectbox[0].select(industries[i % len(industries)])
+        samples["show_journey"].append(_timed(lambda: _show_button(at).click().run()))
+        toggle = next((b for b in at.button if b.label == "Details"), None)
+        if toggle is not None:
+            samples["toggle_card"].append(_timed(lambda: toggle.click().run()))
+        nxt = next((b for b in at.button if b.label.startswith("Next") and not b.disabled), None)
+        if nxt is not None:
+            samples["next_page"].append(_timed(lambda: nxt.click().run()))
+        query = ("mandate", "upi", "tokeniz", "npci")[i % 4]
+        samples["search"].append(_timed(lambda: at.text_input(key="search_query").input(query).run()))
+        assert not at.exception, at.exception
+    return samples
+
+
+def bench_render(metrics, quick):
+    rounds = 5 if quick else 20
+    for script in APPS:
+        for action, values in _render_samples(script, rounds).items():
+            if values:
+                _metric(metrics, f"render.{script}.{action}.median", statistics.median(values), "ms")
+
+
+# -------------------------
+# load
+# -------------------------
+USER_SNIPPET = """
+import json, os, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({script!r}, default_timeout=120).run()
+industries = at.selectbox[0].options
+latencies = []
+for i in range({clicks}):
+    at.selectbox[0].select(industries[(os.getpid() + i) % len(industries)])
+    button = next(b for b in at.button if b.label.startswith("\u2728"))
+    t = time.perf_counter()
+    button.click().run()
+    latencies.append((time.perf_counter() - t) * 1e3)
+    assert not at.exception, at.exception
+print(json.dumps(latencies))
+"""
+
+
+def _users(script, users, clicks):
+    """Latencies (ms) of users simultaneous sessions, each its own interpreter."""
+    snippet = USER_SNIPPET.format(script=script, clicks=clicks)
+    procs = [
+        subprocess.Popen([sys.executable, "-c", snippet], cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        for _ in range(users)
+    ]
+    latencies = []
+    for proc in procs:
+        out, err = proc.communicate()
+        if proc.returncode:
+            raise RuntimeError(f"simulated user failed:\n{err}")
+        latencies.extend(json.loads(out.strip().splitlines()[-1]))
+    return latencies
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def bench_load(metrics, quick, users=None):
+    users = users or (4 if quick else 16)
+    clicks = 5 if quick else 20
+    for script in ("product_recommender.py",):
+        start = time.perf_counter()
+        latencies = _users(script, users, clicks)
+        elapsed = time.perf_counter() - start
+        _metric(metrics, f"load.{script}.users={users}.p50", _percentile(latencies, 0.5), "ms")
+        _metric(metrics, f"load.{script}.users={users}.p95", _percentile(latencies, 0.95), "ms")
+        # Includes session start-up; lower is better like everything else
+        _metric(metrics, f"load.{script}.users={users}.wall", elapsed, "s")
+
+
+BENCHES = {"micro": bench_micro, "coldstart": bench_coldstart, "render": bench_render, "load": bench_load}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(parts, quick, output, users=None):
+    metrics = {}
+    for part in parts:
+        start = time.perf_counter()
+        if part == "load":
+            bench_load(metrics, quick, users)
+        else:
+            BENCHES[part](metrics, quick)
+        print(f"[{part}] done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    results = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "quick": quick,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "metrics": metrics,
+    }
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+    for name, m in metrics.items():
+        print(f"{name:<60} {m['value']:>12.3f} {m['unit']}")
+    print(f"wrote {output}", file=sys.stderr)
+    return results
+
+
+_TO_MS = {"s": 1e3, "ms": 1.0, "us": 1e-3}
+
+
+def compare(baseline, current, threshold=0.2, min_delta_ms=0.001):
+    """([(name, base, new, ratio, regressed)], [missing names]) against the baseline.
+
+    missing lists baseline metrics the current run lacks or reports in a
+    different unit; a run that stopped measuring something must not pass.
+    """
+    rows = []
+    missing = []
+    for name, base in sorted(baseline["metrics"].items()):
+        new = current["metrics"].get(name)
+        if new is None or base["unit"] != new["unit"]:
+            missing.append(name)
+            continue
+        if not base["value"]:
+            continue
+        ratio = new["value"] / base["value"]
+        delta_ms = (new["value"] - base["value"]) * _TO_MS.get(base["unit"], 1.0)
+        rows.append((name, base, new, ratio, ratio > 1 + threshold and delta_ms > min_delta_ms))
+    return rows, missing
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_cmd = commands.add_parser("run", help="run the suite and write JSON results")
+    run_cmd.add_argument("--quick", action="store_true", help="smaller sizes and fewer repeats")
+    run_cmd.add_argument("--only", default=",".join(PARTS), help="comma-separated parts: " + ", ".join(PARTS))
+    run_cmd.add_argument("--users", type=int, help="simulated users for the load part")
+    run_cmd.add_argument("-o", "--output", default=str(DEFAULT_OUTPUT))
+    cmp_cmd = commands.add_parser("compare", help="flag regressions against a baseline")
+    cmp_cmd.add_argument("baseline")
+    cmp_cmd.add_argument("current", nargs="?", default=str(DEFAULT_OUTPUT))
+    cmp_cmd.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown as a fraction (default 0.2)")
+    cmp_cmd.add_argument("--min-delta-ms", type=float, default=0.001, help="ignore slowdowns smaller than this (default 1 us)")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        parts = [p.strip() for p in args.only.split(",") if p.strip()]
+        unknown = set(parts) - set(PARTS)
+        if unknown:
+            parser.error(f"unknown part(s): {', '.join(sorted(unknown))}")
+        run(parts, args.quick, args.output, args.users)
+        return 0
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+    rows, missing = compare(baseline, current, args.threshold, args.min_delta_ms)
+    regressions = 0
+    for name, base, new, ratio, regressed in rows:
+        regressions += regressed
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:<60} {base['value']:>12.3f} -> {new['value']:>12.3f} {new['unit']:<3} {ratio:>6.2f}x {flag}")
+    for name in missing:
+        base = baseline["metrics"][name]
+        print(f"{name:<60} {base['value']:>12.3f} -> {'-':>12} {base['unit']:<3} {'':>7} MISSING")
+    print(
+        f"{regressions} regression(s), {len(missing)} missing in {len(rows) + len(missing)} metric(s) "
+        f"(threshold {args.threshold:.0%})"
+    )
+    return 1 if regressions or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""Pre-render every industry journey and the add-on catalog as static files.
+
+    python build_static.py --out dist
+
+Writes, for a CDN or nginx to serve as-is:
+
+    index.html, industries.json
+    journeys/<slug>.html, journeys/<slug>.json   one per industry in the picker
+    addons.html, addons.json
+    manifest.json                                fingerprints for the next build
+
+Every catalog entry is fingerprinted, and each page records the fingerprints
+of the entries it shows. A rebuild only rewrites pages whose inputs changed:
+editing one product touches only the industries that list it (before or
+after the edit). Changing an add-on touches every journey, since each
+journey lists the add-ons.
+"""
+import argparse
+import dataclasses
+import hashlib
+import html
+import json
+import re
+from pathlib import Path
+
+from recommender_core import default_catalog
+
+# Bump when the page templates below change, to force a full rebuild
+TEMPLATE_VERSION = 2
+
+_STYLE = """
+body{font-family:system-ui,sans-serif;max-width:60rem;margin:2rem auto;padding:0 1rem;line-height:1.5}
+details{border:1px solid #ddd;border-radius:.5rem;padding:.5rem 1rem;margin:.5rem 0}
+summary{cursor:pointer;font-weight:600}
+"""
+
+
+def _digest(value):
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def entry_fingerprints(catalog):
+    """Fingerprint per product/add-on (an add-on's recommended flag is part of it)."""
+    prints = {f"product:{name}": _digest(details) for name, details in catalog.products.items()}
+    for name, details in catalog.addons.items():
+        prints[f"addon:{name}"] = _digest([details, name in catalog.recommended_addons])
+    return prints
+
+
+def _entry_key(catalog, name):
+    return f"product:{name}" if name in catalog.products else f"addon:{name}"
+
+
+def slug(label):
+    return re.sub(r"[^0-9a-z]+", "-", label.casefold()).strip("-") or "industry"
+
+
+def _page(title, body):
+    return (
+        "<!doctype html>\n<html lang=\"en\"><head><meta charset=\"utf-8\">"
+        "<meta name=\"viewport\" content=\"width=device-width,initial-scale=1\">"
+        f"<title>{html.escape(title)}</title><style>{_STYLE}</style></head>\n"
+        f"<body>\n{body}\n</body></html>\n"
+    )
+
+
+def card_html(r):
+    e = html.escape
+    rows = [("📂 Category", e(r.category)), ("💡 Why it matters", e(r.why))]
+    if r.api_calls:
+        rows.append(("🔌 API Calls involved", e(", ".join(r.api_calls))))
+    if r.api_reason:
+        rows.append(("🗣 In simple words", e(r.api_reason)))
+    if r.inter_api_flow:
+        rows.append(("🔄 Inter-API Communication", e(r.inter_api_flow)))
+    if r.banks_supported:
+        rows.append(("🏦 Supported Banks/Networks", e(", ".join(r.banks_supported))))
+    if r.integration:
+        rows.append(("⚙️ Integration Steps", e(r.integration)))
+    if r.regulation:
+        rows.append(("📜 Regulatory note (RBI)", e(r.regulation)))
+    if r.demo_video:
+        rows.append(("🎥 Demo Video", f'<a href="{e(r.demo_video)}">Watch here</a>'))
+    if r.merchants_using:
+        rows.append(("🤝 Who’s already using this", e(", ".join(r.merchants_using))))
+    body = "".join(f"<p><strong>{label}:</strong> {value}</p>" for label, value in rows)
+    opened = " open" if r.expanded else ""
+    return f"<details{opened}><summary>📦 {e(r.product)} ({e(r.priority)})</summary>{body}</details>"
+
+
+def _journey_files(label, recs):
+    # No catalog version here: it changes on any edit and would defeat the
+    # per-page fingerprints; manifest.json carries it
+    payload = {
+        "industry": label,
+        "recommendations": [dataclasses.asdict(r) for r in recs],
+    }
+    body = (
+        f"<p><a href=\"../index.html\">← All industries</a></p>"
+        f"<h1>🚀 Juspay Payments Journey: {html.escape(label)}</h1>"
+        + "\n".join(card_html(r) for r in recs)
+    )
+    return json.dumps(payload, ensure_ascii=False, indent=1), _page(f"Juspay journey · {label}", body)
+
+
+def plan(catalog):
+    """{relative path stem: (input fingerprint, render callable)} for every page."""
+    prints = entry_fingerprints(catalog)
+    pages = {}
+    for label in catalog.industries:
+        recs = catalog.recommend(label)
+        inputs = _digest([TEMPLATE_VERSION, label, [(r.product, prints[_entry_key(catalog, r.product)], r.priority) for r in recs]])
+        pages[f"journeys/{slug(label)}"] = (inputs, lambda label=label, recs=recs: _journey_files(label, recs))
+
+    addon_inputs = _digest([TEMPLATE_VERSION, sorted(v for k, v in prints.items() if k.startswith("addon:"))])
+
+    def addons_files():
+        body = "<p><a href=\"index.html\">← All industries</a></p><h1>✨ Juspay Feature Add-ons</h1>" + "\n".join(
+            card_html(r) for r in catalog.index.addons
+        )
+        return json.dumps(catalog.addons, ensure_ascii=False, indent=1), _page("Juspay feature add-ons", body)
+
+    pages["addons"] = (addon_inputs, addons_files)
+
+    def index_files():
+        links = "".join(
+            f"<li><a href=\"journeys/{slug(label)}.html\">{html.escape(label)}</a></li>" for label in catalog.industries
+        )
+        body = (
+            "<h1>🚀 Juspay Payments Journey</h1><p>Pick your business category:</p>"
+            f"<ul>{links}</ul><p><a href=\"addons.html\">✨ Feature add-ons</a></p>"
+        )
+        listing = [{"industry": label, "journey": f"journeys/{slug(label)}.json"} for label in catalog.industries]
+        return json.dumps(listing, ensure_ascii=False, indent=1), _page("Juspay Payments Journey", body)
+
+    pages["index"] = (_digest([TEMPLATE_VERSION, list(catalog.industries)]), index_files)
+    return prints, pages
+
+
+def build(out, catalog=None, force=False):
+    """Render changed pages into out; returns (rebuilt, unchanged, removed) page stems."""
+    catalog = catalog or default_catalog()
+    out = Path(out)
+    manifest_path = out / "manifest.json"
+    try:
+        previous = json.loads(manifest_path.read_text(encoding="utf-8"))["pages"]
+    except (OSError, ValueError, KeyError):
+        previous = {}
+
+    prints, pages = plan(catalog)
+    rebuilt, unchanged = [], []
+    for stem, (inputs, render) in pages.items():
+        json_path = out / ("industries.json" if stem == "index" else f"{stem}.json")
+        html_path = out / f"{stem}.html"
+        if not force and previous.get(stem) == inputs and json_path.exists() and html_path.exists():
+            unchanged.append(stem)
+            continue
+        json_text, html_text = render()
+        html_path.parent.mkdir(parents=True, exist_ok=True)
+        json_path.write_text(json_text, encoding="utf-8")
+        html_path.write_text(html_text, encoding="utf-8")
+        rebuilt.append(stem)
+
+    removed = sorted(set(previous) - set(pages))
+    for stem in removed:
+        for suffix in (".json", ".html"):
+            (out / f"{stem}{suffix}").unlink(missing_ok=True)
+
+    manifest = {
+        "catalog_version": catalog.version,
+        "template_version": TEMPLATE_VERSION,
+        "entries": prints,
+        "pages": {stem: inputs for stem, (inputs, _) in pages.items()},
+    }
+    out.mkdir(parents=True, exist_ok=True)
+    manifest_path.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+    return rebuilt, unchanged, removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-render static journey bundles.")
+    parser.add_argument("--out", default="dist", help="output directory (default: dist)")
+    parser.add_argument("--force", action="store_true", help="rebuild every page")
+    args = parser.parse_args(argv)
+
+    rebuilt, unchanged, removed = build(args.out, force=args.force)
+    print(f"rebuilt {len(rebuilt)}, unchanged {len(unchanged)}, removed {len(removed)} page(s) in {args.out}")
+    for stem in rebuilt:
+        print(f"  + {stem}")
+    for stem in removed:
+        print(f"  - {stem}")
+
+
+if __name__ == "__main__":
+    main()
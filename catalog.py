@@ -0,0 +1,155 @@
+"""Juspay product catalog: data file loading, validation and binary snapshots.
+
+The catalog lives in catalog.json next to this module (override with the
+RECOMMENDER_CATALOG environment variable). .json is always supported, .toml
+on Python 3.11+, and .yaml/.yml when PyYAML is installed.
+
+Parsing and validating the source is done once; the compiled result is
+written to a "<source>.snapshot" file that later startups memory-map and
+unmarshal instead, as long as the source's mtime and size still match and
+the snapshot was compiled by the same code (a fingerprint of the compiler,
+passed in by the caller as key).
+"""
+import json
+import marshal
+import mmap
+import os
+import struct
+from pathlib import Path
+
+CATALOG_PATH = Path(os.environ.get("RECOMMENDER_CATALOG", Path(__file__).with_name("catalog.json")))
+
+_PRODUCT_TEXT = ("category", "why", "api_reason", "inter_api_flow", "integration", "regulation")
+_PRODUCT_LISTS = ("features", "api_calls", "banks_supported", "must_have", "good_to_have")
+_ADDON_TEXT = ("category", "why", "integration", "demo_video")
+_ADDON_LISTS = ("features", "api_calls", "merchants_using")
+
+_SNAPSHOT_MAGIC = b"JRCS"
+# magic, format version, source mtime_ns, source size, compiler fingerprint
+_SNAPSHOT_HEADER = struct.Struct("<4sHqQ16s")
+SNAPSHOT_FORMAT = 2
+
+
+class CatalogError(ValueError):
+    """The catalog source is unreadable or fails validation."""
+
+
+def _parse(path):
+    suffix = path.suffix.lower()
+    if suffix == ".json":
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    if suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError:
+            raise CatalogError("TOML catalogs need Python 3.11+")
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    if suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise CatalogError("YAML catalogs need PyYAML (pip install pyyaml)")
+        with open(path, encoding="utf-8") as f:
+            try:
+                return yaml.safe_load(f)
+            except yaml.YAMLError as exc:
+                raise CatalogError(f"cannot read {path}: {exc}") from exc
+    raise CatalogError(f"unsupported catalog format: {path.name}")
+
+
+def _check_entry(kind, name, entry, text_fields, list_fields, errors):
+    if not isinstance(entry, dict):
+        errors.append(f"{kind} {name!r} must be a mapping")
+        return
+    for field in text_fields:
+        if not isinstance(entry.get(field, ""), str):
+            errors.append(f"{kind} {name!r}: {field} must be a string")
+    for field in list_fields:
+        value = entry.get(field, [])
+        if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+            errors.append(f"{kind} {name!r}: {field} must be a list of strings")
+
+
+def validate(data):
+    """Check the parsed catalog and return it; raises CatalogError listing every problem."""
+    if not isinstance(data, dict):
+        raise CatalogError("catalog must be a mapping")
+    errors = []
+    products = data.get("products")
+    addons = data.get("feature_addons")
+    if not isinstance(products, dict):
+        errors.append("products must be a mapping of product name to details")
+        products = {}
+    if not isinstance(addons, dict):
+        errors.append("feature_addons must be a mapping of add-on name to details")
+        addons = {}
+    for name, entry in products.items():
+        _check_entry("product", name, entry, _PRODUCT_TEXT, _PRODUCT_LISTS, errors)
+    for name, entry in addons.items():
+        _check_entry("add-on", name, entry, _ADDON_TEXT, _ADDON_LISTS, errors)
+    valid = set()
+    for key in ("recommended_addons", "industries"):
+        value = data.get(key, [])
+        if isinstance(value, list) and all(isinstance(item, str) for item in value):
+            valid.add(key)
+        else:
+            errors.append(f"{key} must be a list of strings")
+    if "recommended_addons" in valid:
+        unknown = [name for name in data.get("recommended_addons", []) if name not in addons]
+        if unknown:
+            errors.append(f"recommended_addons names unknown add-ons: {', '.join(unknown)}")
+    if errors:
+        raise CatalogError("invalid catalog:\n  " + "\n  ".join(errors))
+    data.setdefault("recommended_addons", [])
+    data.setdefault("industries", [])
+    return data
+
+
+def load(path=CATALOG_PATH):
+    """Parse and validate a catalog source file."""
+    path = Path(path)
+    try:
+        data = _parse(path)
+    except (OSError, ValueError) as exc:
+        if isinstance(exc, CatalogError):
+            raise
+        raise CatalogError(f"cannot read {path}: {exc}") from exc
+    return validate(data)
+
+
+def snapshot_path(path):
+    path = Path(path)
+    return path.with_name(path.name + ".snapshot")
+
+
+def read_snapshot(path, stat, key=b""):
+    """Return the payload stored for this exact source (mtime + size) and key, or None."""
+    try:
+        with open(snapshot_path(path), "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) < _SNAPSHOT_HEADER.size:
+                return None
+            header = _SNAPSHOT_HEADER.unpack_from(mm)
+            if header != (_SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, stat.st_mtime_ns, stat.st_size, key.ljust(16, b"\0")[:16]):
+                return None
+            with memoryview(mm) as view:
+                return marshal.loads(view[_SNAPSHOT_HEADER.size:])
+    except (OSError, ValueError, EOFError, TypeError):
+        return None
+
+
+def write_snapshot(path, stat, payload, key=b""):
+    """Best effort: a read-only deploy just keeps parsing the source."""
+    target = snapshot_path(path)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, stat.st_mtime_ns, stat.st_size, key))
+            f.write(marshal.dumps(payload))
+        os.replace(tmp, target)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
@@ -0,0 +1,174 @@
+"""Payment-volume time series for the "Educational Data" tab.
+
+Series are kept in long format, one row per observation:
+
+    Period (datetime64)  Method (category)  Region (category, optional)
+    Unit (category, "value" when absent)  Value (float32)
+
+load_series() reads CSV or Parquet in chunks and only loads the columns it
+needs, so NPCI/RBI monthly exports with millions of rows fit in a few bytes
+per row. Growth and CAGR are computed with groupby-vectorized operations, and
+downsample() caps the points per series, so the browser never receives the
+full series.
+
+Import this module lazily; it pulls in pandas.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+COLUMNS = ("Period", "Method", "Region", "Unit", "Value")
+CATEGORICAL = ("Method", "Region", "Unit")
+SERIES_KEYS = ("Method", "Unit")
+DEFAULT_UNIT = "value"
+
+# The original six-year table (Indian fiscal years start in April)
+BUILTIN = {
+    "Method": ["UPI", "PPIs", "BBPS", "ATMs (Volumes)", "NACH"],
+    "FY21-22": [84.1, None, 1.152, 6.5, 246],
+    "FY22-23": [139.14, 3.7, 1.916, 6.9, 307],
+    "FY23-24 (E)": [207.6, 3.9, 3.054, 7.4, 359],
+    "FY24-25 (E)": [291.3, 4.1, 4.646, 7.8, 422],
+    "FY25-26 (E)": [365.7, 4.3, 6.689, 8.2, 498],
+    "FY26-27 (E)": [455.6, 4.6, 9.086, 8.6, 591],
+    "Unit": ["INR trillion", "INR trillion", "INR billion", "Billion transactions", "INR trillion"],
+}
+
+
+def builtin_table():
+    """The six-year table as originally shown (wide format)."""
+    return pd.DataFrame(BUILTIN)
+
+
+def builtin_series():
+    wide = builtin_table()
+    long = wide.melt(id_vars=["Method", "Unit"], var_name="Fiscal year", value_name="Value")
+    long["Period"] = pd.to_datetime("20" + long["Fiscal year"].str[2:4] + "-04-01")
+    return _compact(long[["Period", "Method", "Unit", "Value"]])
+
+
+def _compact(df):
+    for column in CATEGORICAL:
+        if column in df and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+    df["Value"] = df["Value"].astype(np.float32)
+    return df
+
+
+def _concat(chunks):
+    """Concatenate compacted chunks without falling back to object columns."""
+    if not chunks:
+        return pd.DataFrame({c: pd.Series(dtype="category") for c in CATEGORICAL if c != "Region"})
+    merged = {}
+    for column in chunks[0].columns:
+        if isinstance(chunks[0][column].dtype, pd.CategoricalDtype):
+            merged[column] = union_categoricals([c[column] for c in chunks], ignore_order=True)
+        else:
+            merged[column] = np.concatenate([c[column].to_numpy() for c in chunks])
+    return pd.DataFrame(merged)
+
+
+def load_series(path, columns=None, chunksize=1_000_000):
+    """Load a long-format series file (.csv or .parquet), projecting to columns.
+
+    columns defaults to every column of COLUMNS the file has; Period, Method
+    and Value are always required. Without a Unit column every series gets
+    DEFAULT_UNIT.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".parquet":
+        import pyarrow.parquet as pq
+
+        source = pq.ParquetFile(path)
+        available = source.schema_arrow.names
+    else:
+        available = pd.read_csv(path, nrows=0).columns.tolist()
+    wanted = [c for c in (columns or COLUMNS) if c in available]
+    missing = {"Period", "Method", "Value"} - set(wanted)
+    if missing:
+        raise ValueError(f"{path.name} is missing column(s): {', '.join(sorted(missing))}")
+
+    chunks = []
+    if path.suffix.lower() == ".parquet":
+        for batch in source.iter_batches(batch_size=chunksize, columns=wanted):
+            chunks.append(_compact(batch.to_pandas()))
+    else:
+        dtypes = {c: "category" for c in CATEGORICAL if c in wanted}
+        dtypes["Value"] = np.float32
+        reader = pd.read_csv(path, usecols=wanted, dtype=dtypes, parse_dates=["Period"], chunksize=chunksize)
+        for chunk in reader:
+            chunks.append(_compact(chunk))
+    df = _concat(chunks)
+    df["Period"] = pd.to_datetime(df["Period"])
+    if "Unit" not in df:
+        df["Unit"] = pd.Categorical([DEFAULT_UNIT] * len(df))
+    return df
+
+
+def aggregate(df, keys=SERIES_KEYS):
+    """Sum over every dimension not in keys (e.g. regions) per Period."""
+    keys = [k for k in keys if k in df]
+    out = df.groupby([*keys, "Period"], observed=True, sort=True)["Value"].sum(min_count=1).reset_index()
+    out["Value"] = out["Value"].astype(np.float32)
+    return out
+
+
+def with_growth(df, keys=SERIES_KEYS):
+    """Add period-over-period growth (fraction) per series."""
+    keys = [k for k in keys if k in df]
+    df = df.sort_values([*keys, "Period"], ignore_index=True)
+    df["Growth"] = df.groupby(keys, observed=True)["Value"].pct_change(fill_method=None).astype(np.float32)
+    return df
+
+
+def latest_growth(df, keys=SERIES_KEYS):
+    """Growth between each series' last two observed values, with the last Period."""
+    keys = [k for k in keys if k in df]
+    growth = with_growth(df.dropna(subset=["Value"]), keys)
+    latest = growth.groupby(keys, observed=True).tail(1)
+    return latest[[*keys, "Period", "Growth"]].rename(columns={"Period": "Latest"}).reset_index(drop=True)
+
+
+def cagr(df, keys=SERIES_KEYS):
+    """Compound annual growth per series between its first and last observed values."""
+    keys = [k for k in keys if k in df]
+    observed = df.dropna(subset=["Value"]).sort_values([*keys, "Period"])
+    g = observed.groupby(keys, observed=True)
+    summary = g.agg(
+        Start=("Period", "first"),
+        End=("Period", "last"),
+        First=("Value", "first"),
+        Last=("Value", "last"),
+    )
+    years = (summary["End"] - summary["Start"]).dt.days / 365.25
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.power(summary["Last"] / summary["First"], 1 / years) - 1
+    summary["CAGR"] = rate.where((years > 0) & (summary["First"] > 0))
+    return summary.reset_index()
+
+
+def downsample(df, max_points=300, keys=SERIES_KEYS):
+    """At most max_points rows per series, averaging consecutive observations into buckets."""
+    keys = [k for k in keys if k in df]
+    df = df.sort_values([*keys, "Period"], ignore_index=True)
+    g = df.groupby(keys, observed=True)
+    position = g.cumcount().to_numpy()
+    size = g["Value"].transform("size").to_numpy()
+    if size.size == 0 or size.max() <= max_points:
+        return df
+    bucket = position * max_points // size
+    out = df.assign(_bucket=bucket).groupby([*keys, "_bucket"], observed=True, sort=False).agg(
+        Period=("Period", "first"),
+        Value=("Value", "mean"),
+    )
+    out["Value"] = out["Value"].astype(np.float32)
+    return out.reset_index().drop(columns="_bucket")
+
+
+def chart_frame(df, max_points=300):
+    """Downsampled Period x series matrix for st.line_chart."""
+    small = downsample(df, max_points)
+    label = small["Method"].astype(str) + " (" + small["Unit"].astype(str) + ")"
+    return small.assign(Series=label).pivot_table(index="Period", columns="Series", values="Value", observed=True)
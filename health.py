@@ -0,0 +1,403 @@
+"""Live payment health from a stream of outcome events, for re-ranking journeys.
+
+Events are CSV lines, one payment outcome each:
+
+    ts,method,bank,ok,latency_ms
+    1760700000.25,UPI,HDFC Bank,1,840
+
+ok is 1/0 (or true/false, success/failure). They arrive from a feed:
+
+    path/to/events.log    tailed like tail -F (follows truncation/rotation)
+    tcp://127.0.0.1:9009  a line-oriented TCP listener
+    a queue.Queue         any in-process producer putting lists of lines
+
+Per (method, bank), HealthWindow keeps time-bucketed ring buffers (one bucket
+per second over the window): success and attempt counts plus a log-spaced
+latency histogram. Recording an event touches one bucket, so an update is O(1).
+Events are parsed and recorded in batches with NumPy on a background thread.
+The UI only reads a snapshot, rebuilt at most once a second.
+
+rerank() reorders a journey's payment products within each priority tier by
+their current success rate (smoothed toward the overall rate when traffic is
+thin). It also reorders every product's banks_supported the same way.
+Add-ons keep their place.
+
+    RECOMMENDER_HEALTH_FEED=<path | tcp://host:port>   enable it in the apps
+"""
+import math
+import os
+import queue
+import re
+import socketserver
+import threading
+import time
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from bank_coverage import canonical_bank
+
+# Feed method labels -> catalog product (both folded with method_key)
+METHOD_ALIASES = {
+    "card": "cardswithtokenization",
+    "cards": "cardswithtokenization",
+    "creditcard": "cardswithtokenization",
+    "debitcard": "cardswithtokenization",
+    "nb": "netbanking",
+    "upicollect": "upi",
+    "upiintent": "upi",
+}
+
+# Latency histogram: log-spaced bucket edges from 1 ms to ~65 s
+LATENCY_EDGES_MS = np.geomspace(1.0, 65_536.0, 49)
+# Weight (in events) of the overall success rate when smoothing thin traffic
+PRIOR_EVENTS = 20
+# Clock skew tolerated on event timestamps; later ones (e.g. ms epochs) are dropped
+MAX_FUTURE_S = 5.0
+
+_TRUE = frozenset(("1", "true", "ok", "success", "succeeded", "charged"))
+
+
+def method_key(name):
+    key = re.sub(r"[^0-9a-z]+", "", name.casefold())
+    return METHOD_ALIASES.get(key, key)
+
+
+@dataclass(frozen=True, slots=True)
+class Health:
+    events: int
+    success_rate: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+class HealthWindow:
+    """Sliding-window counts and latency histograms per key, in ring buffers."""
+
+    def __init__(self, window_s=60, bucket_s=1.0, capacity=64):
+        self.bucket_s = bucket_s
+        self.slots = max(1, int(math.ceil(window_s / bucket_s)))
+        self.bins = len(LATENCY_EDGES_MS) + 1
+        self._lock = threading.Lock()
+        self._alloc(capacity)
+
+    def _alloc(self, capacity):
+        self.epoch = np.full((capacity, self.slots), -1, dtype=np.int64)
+        self.attempts = np.zeros((capacity, self.slots), dtype=np.uint32)
+        self.successes = np.zeros((capacity, self.slots), dtype=np.uint32)
+        self.latency = np.zeros((capacity, self.slots, self.bins), dtype=np.uint32)
+
+    def _grow(self, needed):
+        old = (self.epoch, self.attempts, self.successes, self.latency)
+        capacity = len(old[0])
+        while capacity < needed:
+            capacity *= 2
+        self._alloc(capacity)
+        for new, prev in zip((self.epoch, self.attempts, self.successes, self.latency), old):
+            new[: len(prev)] = prev
+
+    def record(self, keys, ts, ok, latency_ms, now=None):
+        """Add a batch of events (parallel arrays; keys are small ints); returns how many were kept.
+
+        The window ends at now (wall clock by default), as in totals(). Events
+        older than the window are dropped, and so are events more than
+        MAX_FUTURE_S ahead of now; smaller skew counts in the current bucket.
+        """
+        if not len(keys):
+            return 0
+        now = time.time() if now is None else now
+        current = int(now // self.bucket_s)
+        ts = np.asarray(ts, dtype=np.float64)
+        # A slot then holds one epoch
+        fresh = (ts // self.bucket_s > current - self.slots) & (ts <= now + MAX_FUTURE_S)
+        keys, ts, ok, latency_ms = keys[fresh], ts[fresh], ok[fresh], latency_ms[fresh]
+        epoch = np.minimum(ts // self.bucket_s, current).astype(np.int64)
+        if not len(keys):
+            return 0
+        with self._lock:
+            if keys.max() >= len(self.epoch):
+                self._grow(int(keys.max()) + 1)
+            slot = epoch % self.slots
+            stored = self.epoch[keys, slot]
+            # A bucket last written a full window ago is recycled
+            stale = stored < epoch
+            if stale.any():
+                k, s = keys[stale], slot[stale]
+                self.attempts[k, s] = 0
+                self.successes[k, s] = 0
+                self.latency[k, s] = 0
+                self.epoch[k, s] = epoch[stale]
+            live = ~(stored > epoch)
+            k, s = keys[live], slot[live]
+            np.add.at(self.attempts, (k, s), 1)
+            np.add.at(self.successes, (k, s), ok[live])
+            np.add.at(self.latency, (k, s, np.searchsorted(LATENCY_EDGES_MS, latency_ms[live])), 1)
+        return len(keys)
+
+    def totals(self, now=None):
+        """(attempts, successes, latency histograms) per key over the window ending at now."""
+        current = int((time.time() if now is None else now) // self.bucket_s)
+        with self._lock:
+            valid = (self.epoch > current - self.slots) & (self.epoch <= current)
+            attempts = np.where(valid, self.attempts, 0).sum(axis=1)
+            successes = np.where(valid, self.successes, 0).sum(axis=1)
+            latency = np.where(valid[:, :, None], self.latency, 0).sum(axis=1)
+        return attempts, successes, latency
+
+
+def _quantiles(hist, qs=(0.5, 0.95, 0.99)):
+    total = hist.sum()
+    if not total:
+        return (math.nan,) * len(qs)
+    cumulative = np.cumsum(hist)
+    # Upper edge of the bucket holding the quantile (the last bucket is open-ended)
+    edges = np.append(LATENCY_EDGES_MS, LATENCY_EDGES_MS[-1])
+    return tuple(float(edges[np.searchsorted(cumulative, q * total)]) for q in qs)
+
+
+class HealthSnapshot:
+    """Immutable per-(method, bank) and per-method health at one instant."""
+
+    __slots__ = ("taken", "overall", "pairs", "methods")
+
+    def __init__(self, taken, keys, attempts, successes, latency):
+        self.taken = taken
+        total = int(attempts.sum())
+        self.overall = (int(successes.sum()) / total) if total else 1.0
+        self.pairs = {}
+        by_method = {}
+        for i, key in enumerate(keys):
+            if attempts[i]:
+                self.pairs[key] = self._health(attempts[i], successes[i], latency[i])
+                acc = by_method.setdefault(key[0], [0, 0, np.zeros_like(latency[i])])
+                acc[0] += attempts[i]
+                acc[1] += successes[i]
+                acc[2] += latency[i]
+        self.methods = {m: self._health(*acc) for m, acc in by_method.items()}
+
+    @staticmethod
+    def _health(attempts, successes, hist):
+        return Health(int(attempts), int(successes) / int(attempts), *_quantiles(hist))
+
+    def score(self, health):
+        """Success rate smoothed toward the overall rate; higher is healthier."""
+        if health is None:
+            return self.overall
+        return (health.success_rate * health.events + self.overall * PRIOR_EVENTS) / (health.events + PRIOR_EVENTS)
+
+    def method(self, product):
+        return self.methods.get(method_key(product))
+
+    def bank(self, product, bank):
+        return self.pairs.get((method_key(product), canonical_bank(bank)))
+
+    def describe(self, products):
+        """'UPI 97.1% ok, p95 1024 ms' for each of products with traffic."""
+        parts = []
+        for name in products:
+            health = self.method(name)
+            if health is not None:
+                parts.append(f"{name} {health.success_rate:.1%} ok, p95 {health.p95_ms:.0f} ms")
+        return parts
+
+
+def rerank(recs, snapshot, products):
+    """recs with products reordered by health inside each priority tier, banks too.
+
+    products names the payment products (catalog.products); other records are
+    add-ons and keep their place.
+    """
+    if snapshot is None or not snapshot.pairs:
+        return recs
+    recs = list(recs)
+    tiers = {}
+    for i, r in enumerate(recs):
+        if r.product in products:
+            tiers.setdefault(r.priority, []).append(i)
+    for positions in tiers.values():
+        ranked = sorted(
+            (recs[i] for i in positions),
+            key=lambda r: -snapshot.score(snapshot.method(r.product)),
+        )
+        for i, r in zip(positions, ranked):
+            banks = tuple(sorted(r.banks_supported, key=lambda b: -snapshot.score(snapshot.bank(r.product, b))))
+            recs[i] = replace(r, banks_supported=banks) if banks != r.banks_supported else r
+    return tuple(recs)
+
+
+class HealthMonitor:
+    """Parses batches of event lines off a queue into a HealthWindow on a daemon thread."""
+
+    def __init__(self, window_s=60, bucket_s=1.0, max_batches=1024, snapshot_every_s=1.0):
+        self.window = HealthWindow(window_s, bucket_s)
+        self.feed = queue.Queue(maxsize=max_batches)
+        self.key_ids = {}  # (raw method, raw bank) -> id
+        self.pair_ids = {}  # (method key, bank key) -> id
+        self.keys = []  # id -> (method key, bank key)
+        self.events = 0
+        self.rejected = 0  # malformed lines
+        self.dropped = 0  # outside the window, or too far in the future
+        self._snapshot = None
+        self._snapshot_every_s = snapshot_every_s
+        self._thread = threading.Thread(target=self._run, name="health-ingest", daemon=True)
+        self._thread.start()
+
+    def _key(self, method, bank):
+        # Spellings of the same pair ("HDFC", "HDFC Bank") share one id
+        pair = (method_key(method), canonical_bank(bank))
+        key = self.pair_ids.get(pair)
+        if key is None:
+            key = self.pair_ids[pair] = len(self.keys)
+            self.keys.append(pair)
+        self.key_ids[(method, bank)] = key
+        return key
+
+    def parse(self, lines):
+        """Parallel arrays for the well-formed lines of a batch."""
+        key_ids, ts, ok, latency = [], [], [], []
+        for line in lines:
+            parts = line.split(",")
+            if len(parts) != 5:
+                self.rejected += 1
+                continue
+            try:
+                t, lat = float(parts[0]), float(parts[4])
+            except ValueError:
+                # Header lines land here too
+                self.rejected += 1
+                continue
+            key = self.key_ids.get((parts[1], parts[2]))
+            key_ids.append(key if key is not None else self._key(parts[1], parts[2]))
+            ts.append(t)
+            ok.append(parts[3].strip().lower() in _TRUE)
+            latency.append(lat)
+        return (
+            np.array(key_ids, dtype=np.intp),
+            np.array(ts, dtype=np.float64),
+            np.array(ok, dtype=np.uint32),
+            np.array(latency, dtype=np.float64),
+        )
+
+    def ingest(self, lines, now=None):
+        """Parse and record lines; now is the window's end (wall clock by default)."""
+        keys, ts, ok, latency = self.parse(lines)
+        kept = self.window.record(keys, ts, ok, latency, now)
+        self.events += kept
+        self.dropped += len(keys) - kept
+
+    def _run(self):
+        while True:
+            batch = self.feed.get()
+            # Coalesce whatever else is queued into one NumPy update
+            while len(batch) < 65536:
+                try:
+                    batch = batch + self.feed.get_nowait()
+                except queue.Empty:
+                    break
+            self.ingest(batch)
+
+    def snapshot(self, now=None):
+        """HealthSnapshot of the current window, rebuilt at most every snapshot_every_s."""
+        cached = self._snapshot
+        clock = time.monotonic()
+        if cached is not None and now is None and clock - cached.taken < self._snapshot_every_s:
+            return cached
+        keys = list(self.keys)
+        # Wall clock, not the newest event: a feed that goes quiet ages out
+        attempts, successes, latency = self.window.totals(now)
+        # A key interned after the copy (or before the window grew) waits a snapshot
+        n = min(len(keys), len(attempts))
+        snapshot = HealthSnapshot(clock, keys, attempts[:n], successes[:n], latency[:n])
+        if now is None:
+            self._snapshot = snapshot
+        return snapshot
+
+    def rerank(self, recs, products):
+        return rerank(recs, self.snapshot(), products)
+
+    # -------------------------
+    # Feeds
+    # -------------------------
+    def follow(self, path, from_start=False, poll_s=0.05):
+        """Tail path on a daemon thread (survives truncation and rotation).
+
+        An existing file is read from its end unless from_start; one created
+        later is read from its first line.
+        """
+        skip_existing = not from_start and os.path.exists(path)
+
+        def run():
+            handle, inode, pending = None, None, ""
+            while True:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    time.sleep(poll_s)
+                    continue
+                if handle is None or stat.st_ino != inode or stat.st_size < handle.tell():
+                    if handle is not None:
+                        handle.close()
+                    handle = open(path, encoding="utf-8", errors="replace")
+                    if inode is None and skip_existing:
+                        handle.seek(0, os.SEEK_END)
+                    inode, pending = stat.st_ino, ""
+                chunk = handle.read(1 << 20)
+                if not chunk:
+                    time.sleep(poll_s)
+                    continue
+                lines = (pending + chunk).split("\n")
+                pending = lines.pop()
+                if lines:
+                    self.feed.put(lines)
+
+        threading.Thread(target=run, name="health-tail", daemon=True).start()
+
+    def listen(self, host="127.0.0.1", port=9009):
+        """Accept event lines over TCP on a daemon thread; returns the server."""
+        feed = self.feed
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                # recv() returns whatever has arrived, so a slow feed is still
+                # delivered as it comes and a fast one in large batches
+                pending = b""
+                while True:
+                    try:
+                        chunk = self.request.recv(1 << 16)
+                    except OSError:
+                        break
+                    if not chunk:
+                        break
+                    lines = (pending + chunk).split(b"\n")
+                    pending = lines.pop()
+                    if lines:
+                        feed.put([line.decode("utf-8", "replace").rstrip("\r") for line in lines])
+                if pending:
+                    feed.put([pending.decode("utf-8", "replace").rstrip("\r")])
+
+        server = socketserver.ThreadingTCPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="health-tcp", daemon=True).start()
+        return server
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def monitor_from_env():
+    """The process-wide monitor for RECOMMENDER_HEALTH_FEED, or None when unset."""
+    global _monitor
+    spec = os.environ.get("RECOMMENDER_HEALTH_FEED")
+    if not spec:
+        return None
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = HealthMonitor()
+            if spec.startswith("tcp://"):
+                host, _, port = spec[len("tcp://"):].rpartition(":")
+                _monitor.listen(host or "127.0.0.1", int(port))
+            else:
+                _monitor.follow(spec)
+    return _monitor
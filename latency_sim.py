@@ -0,0 +1,207 @@
+"""Monte Carlo checkout latency per product, from inter_api_flow and api_calls.
+
+    python latency_sim.py E-Commerce -n 1000000
+    python latency_sim.py Travel --config hops.json --json
+
+Each product's inter_api_flow ("App → Juspay API → NPCI → ...") becomes a
+chain of hops, and every hop draws a lognormal latency and a failure from the
+profile of the node it reaches. Nodes are classified by name (bank, switch,
+juspay, ...) and profiles can be overridden per kind or per node name with a
+JSON config:
+
+    {"hops": {"switch": {"median_ms": 200, "sigma": 0.6, "failure": 0.01},
+              "issuer bank": {"median_ms": 900}},
+     "poll_interval_ms": 500, "max_retries": 2, "retry_backoff_ms": 1000}
+
+A product that calls /status learns the outcome at the next status poll; one
+that calls /retry re-runs a failed attempt after a backoff, up to max_retries.
+Payments are simulated in chunks as (hops x payments) arrays, so millions of
+payments take well under a second per product. Entries without a flow of at
+least two nodes (the add-ons) are not simulated.
+"""
+import argparse
+import dataclasses
+import json
+import math
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from recommender_core import default_catalog
+
+
+@dataclass(frozen=True, slots=True)
+class HopProfile:
+    median_ms: float
+    sigma: float
+    failure: float
+
+
+# Illustrative stub figures; override them with --config
+DEFAULT_HOPS = {
+    "client": HopProfile(20.0, 0.3, 0.0),
+    "juspay": HopProfile(40.0, 0.4, 0.001),
+    "switch": HopProfile(150.0, 0.5, 0.005),
+    "bank": HopProfile(400.0, 0.7, 0.02),
+    "user": HopProfile(20_000.0, 0.5, 0.1),
+    "notify": HopProfile(30.0, 0.3, 0.0005),
+    "service": HopProfile(100.0, 0.5, 0.005),
+}
+
+# First match wins; "Bank confirms to Juspay" is a bank hop
+_KINDS = (
+    ("user", re.compile(r"login|otp|authenticat")),
+    ("bank", re.compile(r"bank|issuer|acquirer")),
+    ("switch", re.compile(r"npci|network")),
+    ("juspay", re.compile(r"juspay")),
+    ("notify", re.compile(r"confirm|notif|merchant")),
+    ("client", re.compile(r"\bapp\b|client|checkout")),
+)
+
+
+def hop_kind(node):
+    lowered = node.casefold()
+    for kind, pattern in _KINDS:
+        if pattern.search(lowered):
+            return kind
+    return "service"
+
+
+def parse_flow(text):
+    """Node names of an inter_api_flow string, in order."""
+    return tuple(n for n in (part.strip(" .") for part in re.split(r"→|->", text or "")) if n)
+
+
+@dataclass(frozen=True)
+class SimConfig:
+    hops: dict = dataclasses.field(default_factory=lambda: dict(DEFAULT_HOPS))
+    poll_interval_ms: float = 500.0
+    max_retries: int = 2
+    retry_backoff_ms: float = 1000.0
+
+    @classmethod
+    def from_dict(cls, data):
+        hops = dict(DEFAULT_HOPS)
+        for name, fields in (data.get("hops") or {}).items():
+            key = name.casefold()
+            base = hops.get(key) or DEFAULT_HOPS[hop_kind(name)]
+            hops[key] = dataclasses.replace(base, **fields)
+        options = {k: data[k] for k in ("poll_interval_ms", "max_retries", "retry_backoff_ms") if k in data}
+        return cls(hops=hops, **options)
+
+    def profile(self, node):
+        return self.hops.get(node.casefold()) or self.hops[hop_kind(node)]
+
+
+class CheckoutModel:
+    """One product's hop chain as per-hop lognormal parameters."""
+
+    __slots__ = ("product", "hops", "mu", "sigma", "failure", "polls", "retries", "status")
+
+    def __init__(self, record, config):
+        nodes = parse_flow(record.inter_api_flow)
+        self.product = record.product
+        # A hop is the call into a node; the first node starts the payment
+        self.hops = nodes[1:]
+        profiles = [config.profile(n) for n in self.hops]
+        self.mu = np.array([math.log(p.median_ms) for p in profiles], dtype=np.float32)[:, None]
+        self.sigma = np.array([p.sigma for p in profiles], dtype=np.float32)[:, None]
+        self.failure = np.array([p.failure for p in profiles], dtype=np.float32)[:, None]
+        self.polls = "/status" in record.api_calls
+        self.retries = config.max_retries if any(c.startswith("/retry") for c in record.api_calls) else 0
+        self.status = config.profile("Juspay API")
+
+    def _attempt(self, rng, n, config):
+        """(elapsed ms, failed) for n attempts; a failure ends the attempt at its hop."""
+        shape = (len(self.hops), n)
+        cumulative = np.cumsum(np.exp(self.mu + self.sigma * rng.standard_normal(shape, dtype=np.float32)), axis=0)
+        failed_at = rng.random(shape, dtype=np.float32) < self.failure
+        failed = failed_at.any(axis=0)
+        stop = np.where(failed, failed_at.argmax(axis=0), len(self.hops) - 1)
+        elapsed = np.take_along_axis(cumulative, stop[None, :], axis=0)[0]
+        if self.polls:
+            # The outcome is seen at the next poll, plus the /status round trip
+            interval = config.poll_interval_ms
+            rtt = np.exp(math.log(self.status.median_ms) + self.status.sigma * rng.standard_normal(n, dtype=np.float32))
+            elapsed = np.ceil(elapsed / interval) * interval + rtt
+        return elapsed, failed
+
+    def simulate(self, n, config, rng, chunk=1_000_000):
+        """Time-to-confirmation in ms per payment; NaN where every attempt failed."""
+        out = np.empty(n, dtype=np.float32)
+        if not self.hops:
+            out.fill(0.0)
+            return out
+        for start in range(0, n, chunk):
+            size = min(chunk, n - start)
+            total = np.zeros(size, dtype=np.float32)
+            pending = np.arange(size)
+            for attempt in range(self.retries + 1):
+                elapsed, failed = self._attempt(rng, pending.size, config)
+                total[pending] += elapsed
+                pending = pending[failed]
+                if not pending.size:
+                    break
+                if attempt < self.retries:
+                    total[pending] += config.retry_backoff_ms
+            total[pending] = np.nan
+            out[start:start + size] = total
+        return out
+
+
+def summarize(times):
+    ok = times[~np.isnan(times)]
+    if not ok.size:
+        return {"payments": int(times.size), "success_rate": 0.0, "p50_ms": None, "p95_ms": None, "p99_ms": None}
+    p50, p95, p99 = np.percentile(ok, (50, 95, 99))
+    return {
+        "payments": int(times.size),
+        "success_rate": ok.size / times.size,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+    }
+
+
+def simulate_journey(industry, n=1_000_000, config=None, seed=None, catalog=None):
+    """{product: summary} for every recommended entry of industry that has a flow."""
+    catalog = catalog or default_catalog()
+    config = config or SimConfig()
+    rng = np.random.default_rng(seed)
+    results = {}
+    for r in catalog.recommend(industry):
+        # Add-ons carry "Not applicable" rather than a flow
+        if len(parse_flow(r.inter_api_flow)) > 1:
+            model = CheckoutModel(r, config)
+            results[r.product] = {"priority": r.priority, "hops": list(model.hops), **summarize(model.simulate(n, config, rng))}
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate checkout time-to-confirmation per recommended product.")
+    parser.add_argument("industry")
+    parser.add_argument("-n", "--payments", type=int, default=1_000_000)
+    parser.add_argument("--config", help="JSON file with hop profiles and poll/retry settings")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    config = SimConfig()
+    if args.config:
+        with open(args.config, encoding="utf-8") as f:
+            config = SimConfig.from_dict(json.load(f))
+    results = simulate_journey(args.industry, args.payments, config, args.seed)
+    if args.json:
+        print(json.dumps(results, indent=1, ensure_ascii=False))
+        return
+    print(f"{'product':<26} {'success':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for product, s in results.items():
+        if s["p50_ms"] is None:
+            print(f"{product:<26} {s['success_rate']:>8.2%} {'-':>9} {'-':>9} {'-':>9}")
+        else:
+            print(f"{product:<26} {s['success_rate']:>8.2%} {s['p50_ms']:>9.0f} {s['p95_ms']:>9.0f} {s['p99_ms']:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""In-process metrics, Prometheus text exposition and slow-rerun profiling.
+
+Counters and histograms are plain dicts keyed by label values behind a lock,
+and timers use perf_counter_ns, so instrumenting a hot path adds about a
+microsecond. Metrics are exposed in Prometheus text format:
+
+    RECOMMENDER_METRICS_PORT=9464   serve /metrics from a background thread
+    RECOMMENDER_METRICS_FILE=path   rewrite a textfile-collector file after reruns
+    recommender_service.py          GET /metrics
+
+Apps wrap their script body in `with metrics.rerun("<app>"):`. Profiling is
+opt-in: with RECOMMENDER_PROFILE_MS=<threshold> every Streamlit rerun runs
+under cProfile, and reruns slower than the threshold are dumped as .prof
+files to RECOMMENDER_PROFILE_DIR (default ./profiles).
+"""
+import cProfile
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+# Seconds; spans sub-microsecond lookups up to slow full-page reruns
+LATENCY_BUCKETS = (
+    1e-6, 5e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+REGISTRY = []
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(
+        '%s="%s"' % (n, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for n, v in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def exposition(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._sample_lines(items))
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        return self._values.get(labels, 0)
+
+    def _sample_lines(self, items):
+        for labels, value in items:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {value}"
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe((time.perf_counter_ns() - self.start) / 1e9, *self.labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # per-bucket counts (+Inf last), sum
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][i] += 1
+            state[1] += value
+
+    def time(self, *labels):
+        """Context manager observing the elapsed seconds of its block."""
+        return _Timer(self, labels)
+
+    def count(self, *labels):
+        state = self._values.get(labels)
+        return sum(state[0]) if state else 0
+
+    def _sample_lines(self, items):
+        names = self.labelnames + ("le",)
+        for labels, (counts, total) in items:
+            running = 0
+            for bound, n in zip(self.buckets + ("+Inf",), counts):
+                running += n
+                yield f"{self.name}_bucket{_labels(names, labels + (bound,))} {running}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {total}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {running}"
+
+
+STAGE_SECONDS = Histogram(
+    "recommender_stage_seconds",
+    "Time spent per hot-path stage (catalog_load, recommend, search, dataframe, render, rerun).",
+    ("stage",),
+)
+RECOMMEND_SECONDS = Histogram("recommender_recommend_seconds", "recommend() latency per industry.", ("industry",))
+RENDER_SECONDS = Histogram("recommender_render_seconds", "Journey card render latency per industry.", ("industry",))
+CATALOG_LOADS = Counter("recommender_catalog_loads_total", "Catalog builds by source (snapshot or parse).", ("source",))
+RERUNS = Counter("recommender_reruns_total", "Streamlit script reruns per app.", ("app",))
+SLOW_RERUNS = Counter("recommender_slow_reruns_total", "Reruns above RECOMMENDER_PROFILE_MS that were profiled.", ("app",))
+
+
+def render_prometheus():
+    lines = []
+    for metric in list(REGISTRY):
+        lines.extend(metric.exposition())
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path):
+    """Atomically write the exposition (for node_exporter's textfile collector)."""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(render_prometheus(), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+_server = None
+_server_failed = False
+_server_lock = threading.Lock()
+
+
+def serve_in_background(port, host="127.0.0.1"):
+    """Start the /metrics endpoint once per process; later calls are no-ops.
+
+    Returns the server, or None when it could not bind (logged once; the app
+    keeps running without the endpoint).
+    """
+    global _server, _server_failed
+    with _server_lock:
+        if _server is None and not _server_failed:
+            # Only processes that serve metrics pay for http.server
+            from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+            class MetricsHandler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?", 1)[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = render_prometheus().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass
+
+            try:
+                _server = ThreadingHTTPServer((host, port), MetricsHandler)
+            except OSError as exc:
+                _server_failed = True
+                log.warning("metrics endpoint disabled: cannot listen on %s:%s (%s)", host, port, exc)
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+    return _server
+
+
+# -------------------------
+# Streamlit rerun hooks
+# -------------------------
+_PROFILE_MS = float(os.environ.get("RECOMMENDER_PROFILE_MS") or 0)
+_PROFILE_DIR = Path(os.environ.get("RECOMMENDER_PROFILE_DIR", "profiles"))
+_METRICS_FILE = os.environ.get("RECOMMENDER_METRICS_FILE")
+_METRICS_PORT = os.environ.get("RECOMMENDER_METRICS_PORT")
+_FILE_EVERY_S = 5.0
+_last_file_write = 0.0
+_warned = set()
+
+
+def _warn_once(what, message, *args):
+    # rerun_finished() runs in a finally block on every rerun: an unwritable
+    # path must neither break the page nor mask st.rerun()/st.stop()
+    if what not in _warned:
+        _warned.add(what)
+        log.warning(message, *args)
+
+
+class Rerun:
+    __slots__ = ("app", "start", "profiler")
+
+    def __init__(self, app):
+        self.app = app
+        self.profiler = None
+        if _PROFILE_MS:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                self.profiler = profiler
+            except ValueError:
+                # Another session's rerun is already being profiled
+                pass
+        self.start = time.perf_counter_ns()
+
+
+@contextmanager
+def rerun(app):
+    """Time (and maybe profile) one Streamlit script run; wrap the script body.
+
+    The run is recorded even when it ends early: st.rerun(), st.stop() and
+    errors all unwind through here, so the profiler is always disabled.
+    """
+    started = rerun_started(app)
+    try:
+        yield started
+    finally:
+        rerun_finished(started)
+
+
+def rerun_started(app):
+    """Start a rerun by hand; prefer rerun(), which cannot miss rerun_finished()."""
+    if _METRICS_PORT:
+        serve_in_background(int(_METRICS_PORT))
+    RERUNS.inc(app)
+    return Rerun(app)
+
+
+def rerun_finished(run):
+    global _last_file_write
+    elapsed = (time.perf_counter_ns() - run.start) / 1e9
+    STAGE_SECONDS.observe(elapsed, "rerun")
+    if run.profiler is not None:
+        run.profiler.disable()
+        if elapsed * 1e3 >= _PROFILE_MS:
+            SLOW_RERUNS.inc(run.app)
+            name = f"{run.app}-{time.strftime('%Y%m%d-%H%M%S')}-{elapsed * 1e3:.0f}ms-{os.getpid()}.prof"
+            try:
+                _PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+                run.profiler.dump_stats(_PROFILE_DIR / name)
+            except OSError as exc:
+                _warn_once("profile", "cannot write profiles to %s (%s)", _PROFILE_DIR, exc)
+    if _METRICS_FILE:
+        now = time.monotonic()
+        if now - _last_file_write >= _FILE_EVERY_S:
+            _last_file_write = now
+            try:
+                write_textfile(_METRICS_FILE)
+            except OSError as exc:
+                _warn_once("textfile", "cannot write %s (%s)", _METRICS_FILE, exc)
@@ -0,0 +1,342 @@
+"""Recommendation core shared by the Streamlit apps and the batch CLI.
+
+No Streamlit (or pandas) import here, so the module can be used headless and
+imports fast. The catalog is walked once by build_index(); after that a
+recommendation is a dictionary lookup that hands back prebuilt, immutable
+Recommendation records. pandas is only imported by recommendations_frame().
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+import catalog as _catalog
+from bank_coverage import BankIndex
+from metrics import CATALOG_LOADS, RECOMMEND_SECONDS, STAGE_SECONDS
+
+log = logging.getLogger(__name__)
+
+# Display names of the Recommendation fields, in order (DataFrame/CSV headers)
+COLUMNS = (
+    "Product",
+    "Category",
+    "Why it matters",
+    "API Calls",
+    "Layman API Reason",
+    "Inter-API Communication",
+    "Banks Supported",
+    "Integration Steps",
+    "Regulation",
+    "Priority",
+    "Demo Video",
+    "Merchants Using This",
+)
+
+# Spellings that have drifted between the catalogs and the industry pickers
+INDUSTRY_ALIASES = {
+    "telcomm": "telecom",
+    "mediatelecomot": "mediatelecomott",
+}
+
+
+def canonical_industry(name):
+    """Fold an industry label to the key used by the index ("Hyper Local" == "Hyperlocal")."""
+    key = re.sub(r"[^0-9a-z]+", "", name.casefold())
+    return INDUSTRY_ALIASES.get(key, key)
+
+
+@dataclass(frozen=True, slots=True)
+class Recommendation:
+    product: str
+    category: str
+    why: str
+    api_calls: tuple
+    api_reason: str
+    inter_api_flow: str
+    banks_supported: tuple
+    integration: str
+    regulation: str
+    priority: str
+    demo_video: str
+    merchants_using: tuple
+
+    @property
+    def expanded(self):
+        """Whether the UI opens this card by default."""
+        return self.priority in ("Must Have", "✨ Recommended Add-on")
+
+    def as_row(self):
+        return tuple(getattr(self, f.name) for f in fields(self))
+
+
+def _product_row(name, details, priority):
+    return Recommendation(
+        name,
+        details.get("category", "General"),
+        details.get("why", ""),
+        tuple(details.get("api_calls", [])),
+        details.get("api_reason", ""),
+        details.get("inter_api_flow", "Not available"),
+        tuple(details.get("banks_supported", [])),
+        details.get("integration", "Details not available"),
+        details.get("regulation", "No regulatory notes"),
+        priority,
+        "",
+        (),
+    )
+
+
+def _addon_row(name, details, priority):
+    return Recommendation(
+        name,
+        details.get("category", "Add-on"),
+        details.get("why", ""),
+        tuple(details.get("api_calls", [])),
+        "",
+        "Not applicable",
+        (),
+        details.get("integration", "Plug-and-play feature"),
+        "No regulatory notes",
+        priority,
+        details.get("demo_video", ""),
+        tuple(details.get("merchants_using", [])),
+    )
+
+
+class CatalogIndex:
+    """Canonical industry -> ordered Recommendations (products first, then add-ons)."""
+
+    __slots__ = ("journeys", "addons")
+
+    def __init__(self, journeys, addons):
+        self.journeys = journeys
+        self.addons = addons
+
+    def lookup(self, industry):
+        # Industries no product targets still get the add-on catalog
+        return self.journeys.get(canonical_industry(industry), self.addons)
+
+
+def build_index(products, addons, recommended_addons=()):
+    """Compile the catalog in a single pass over PRODUCTS and FEATURE_ADDONS."""
+    recommended_addons = set(recommended_addons)
+    addon_rows = tuple(
+        _addon_row(name, details, "✨ Recommended Add-on" if name in recommended_addons else "Add-on")
+        for name, details in addons.items()
+    )
+
+    journeys = {}
+    for name, details in products.items():
+        tiers = {}
+        for industry in details.get("good_to_have", []):
+            tiers[canonical_industry(industry)] = "Good to Have"
+        # Must Have wins when a product lists an industry in both tiers
+        for industry in details.get("must_have", []):
+            tiers[canonical_industry(industry)] = "Must Have"
+        for key, priority in tiers.items():
+            journeys.setdefault(key, []).append(_product_row(name, details, priority))
+
+    return CatalogIndex(
+        {key: tuple(rows) + addon_rows for key, rows in journeys.items()},
+        addon_rows,
+    )
+
+
+def catalog_version(*parts):
+    """Content hash of the catalog; any edit to a product, add-on or industry list changes it."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=sorted)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+# Bump when the compiled index changes shape or content for the same catalog
+# file (rows, tiers, keys); snapshots from another compiler are then ignored
+COMPILER_VERSION = 1
+
+
+def _compiler_key():
+    """Fingerprint of everything besides the source file that a snapshot depends on."""
+    code = [
+        (f.__code__.co_code.hex(), [c for c in f.__code__.co_consts if isinstance(c, (str, int, float))])
+        for f in (canonical_industry, _product_row, _addon_row, build_index)
+    ]
+    payload = [COMPILER_VERSION, [f.name for f in fields(Recommendation)], INDUSTRY_ALIASES, code]
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).digest()[:16]
+
+
+class Catalog:
+    """Everything derived from one catalog version.
+
+    Instances are read-only once built, so a single one can be shared by every
+    session in the process; a reload swaps in a new instance.
+    """
+
+    __slots__ = ("version", "products", "addons", "recommended_addons", "industries", "index", "coverage")
+
+    def __init__(self, products, addons, recommended_addons=(), industries=(), version=None):
+        self.version = version or catalog_version(products, addons, recommended_addons, industries)
+        self.products = products
+        self.addons = addons
+        self.recommended_addons = tuple(recommended_addons)
+        self.industries = tuple(sorted(industries))
+        self.index = build_index(products, addons, recommended_addons)
+        self.coverage = BankIndex(products)
+
+    @classmethod
+    def from_data(cls, data):
+        """Build from a validated catalog mapping (see catalog.load)."""
+        return cls(data["products"], data["feature_addons"], data["recommended_addons"], data["industries"])
+
+    def snapshot(self):
+        """Plain, marshal-able state for catalog.write_snapshot()."""
+        return (
+            self.version,
+            self.products,
+            self.addons,
+            self.recommended_addons,
+            self.industries,
+            {key: tuple(r.as_row() for r in rows) for key, rows in self.index.journeys.items()},
+            tuple(r.as_row() for r in self.index.addons),
+        )
+
+    @classmethod
+    def from_snapshot(cls, payload):
+        version, products, addons, recommended_addons, industries, journeys, addon_rows = payload
+        self = cls.__new__(cls)
+        self.version = version
+        self.products = products
+        self.addons = addons
+        self.recommended_addons = recommended_addons
+        self.industries = industries
+        # Rebuild the records once per distinct row so journeys share add-on records again
+        records = {}
+
+        def revive(rows):
+            return tuple(records.get(row) or records.setdefault(row, Recommendation(*row)) for row in rows)
+
+        self.index = CatalogIndex({key: revive(rows) for key, rows in journeys.items()}, revive(addon_rows))
+        self.coverage = BankIndex(products)
+        return self
+
+    def entries(self):
+        """One record per product and add-on, independent of any industry."""
+        products = tuple(_product_row(name, details, "Payment product") for name, details in self.products.items())
+        return products + self.index.addons
+
+    def recommend(self, industry, banks=None, min_banks=None):
+        """Journey for an industry, optionally limited to products covering banks.
+
+        With banks, a product stays only if it supports all of them (or at
+        least min_banks of them). Add-ons are bank-agnostic and always stay.
+        """
+        start = time.perf_counter_ns()
+        key = canonical_industry(industry)
+        rows = self.index.journeys.get(key, self.index.addons)
+        if banks:
+            # Only the journey's own products are checked, not the whole catalog
+            required = self.coverage.mask(banks)
+            rows = tuple(
+                r for r in rows if r.product not in self.products or self.coverage.covers(r.product, required, min_banks)
+            )
+        elapsed = (time.perf_counter_ns() - start) / 1e9
+        # Unknown labels share one series to keep label cardinality bounded
+        RECOMMEND_SECONDS.observe(elapsed, key if key in self.index.journeys else "other")
+        STAGE_SECONDS.observe(elapsed, "recommend")
+        return rows
+
+
+class CatalogStore:
+    """Serves the current Catalog for a source file, hot-reloading it on mtime change.
+
+    The source is stat()ed at most once per check_interval. A reload runs in
+    whichever caller noticed the change; concurrent callers keep getting the
+    previous Catalog instead of waiting. A source that fails validation is
+    logged and the previous Catalog stays in service.
+    """
+
+    def __init__(self, path, check_interval=1.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._catalog = None
+        self._stamp = None
+        self._next_check = 0.0
+
+    def get(self):
+        current = self._catalog
+        now = time.monotonic()
+        if current is not None and now < self._next_check:
+            return current
+        self._next_check = now + self.check_interval
+        try:
+            stat = os.stat(self.path)
+        except OSError as exc:
+            if current is None:
+                raise _catalog.CatalogError(f"cannot read {self.path}: {exc}") from exc
+            return current
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return current
+
+        if current is None:
+            self._lock.acquire()
+        elif not self._lock.acquire(blocking=False):
+            return current
+        try:
+            if stamp != self._stamp:
+                try:
+                    self._catalog = self._load(stat)
+                except _catalog.CatalogError:
+                    if self._catalog is None:
+                        raise
+                    log.exception("catalog reload failed; keeping version %s", self._catalog.version)
+                self._stamp = stamp
+        finally:
+            self._lock.release()
+        return self._catalog
+
+    def _load(self, stat):
+        key = _compiler_key()
+        with STAGE_SECONDS.time("catalog_load"):
+            payload = _catalog.read_snapshot(self.path, stat, key)
+            if payload is not None:
+                try:
+                    result = Catalog.from_snapshot(payload)
+                except Exception:
+                    # A snapshot this code cannot revive is only a cache miss
+                    log.warning("ignoring unreadable catalog snapshot for %s", self.path, exc_info=True)
+                else:
+                    CATALOG_LOADS.inc("snapshot")
+                    return result
+            result = Catalog.from_data(_catalog.load(self.path))
+            CATALOG_LOADS.inc("parse")
+        # Only stamp the snapshot if the source did not change while we parsed it
+        after = os.stat(self.path)
+        if (after.st_mtime_ns, after.st_size) == (stat.st_mtime_ns, stat.st_size):
+            _catalog.write_snapshot(self.path, stat, result.snapshot(), key)
+        return result
+
+
+_STORE = CatalogStore(_catalog.CATALOG_PATH)
+
+
+def default_catalog():
+    """The current catalog from catalog.CATALOG_PATH (hot-reloaded)."""
+    return _STORE.get()
+
+
+def recommend(industry, catalog=None, banks=None, min_banks=None):
+    """Recommendation records for an industry label (see Catalog.recommend)."""
+    return (catalog or default_catalog()).recommend(industry, banks, min_banks)
+
+
+def recommendations_frame(records):
+    """Records as a pandas DataFrame with the COLUMNS headers, for exports."""
+    with STAGE_SECONDS.time("dataframe"):
+        import pandas as pd
+
+        return pd.DataFrame.from_records([r.as_row() for r in records], columns=COLUMNS)
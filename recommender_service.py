@@ -0,0 +1,246 @@
+"""Asyncio JSON/HTTP service for the recommender (stdlib only).
+
+    python recommender_service.py --host 127.0.0.1 --port 8080
+
+    GET /industries                  industry labels offered by the UI
+    GET /recommendations/<industry>  journey for an industry (URL-encoded label)
+    GET /addons                      the FEATURE_ADDONS catalog
+    GET /healthz                     liveness + catalog version
+    GET /metrics                     Prometheus text exposition (see metrics.py)
+
+Every response is serialized, gzipped and framed once per catalog version, so
+a request is a dict lookup and a single write. Responses carry an ETag and
+honour If-None-Match with a 304 and Accept-Encoding q-values. Connections are
+HTTP/1.1 keep-alive and pipelining-safe: a Content-Length body is read and
+discarded, and a chunked (Transfer-Encoding) request gets its reply and then
+the connection is closed. uvloop is used when installed.
+"""
+import argparse
+import asyncio
+import dataclasses
+import functools
+import gzip
+import hashlib
+import json
+from urllib.parse import unquote
+
+from metrics import render_prometheus
+from recommender_core import canonical_industry, default_catalog
+
+_JOURNEY_PREFIX = "/recommendations/"
+_MAX_HEADER_BYTES = 16 * 1024
+# Request bodies are read and discarded up to this size; larger ones close the connection
+_MAX_BODY_BYTES = 64 * 1024
+_DRAIN_ABOVE = 64 * 1024
+
+
+def _error(status, reason):
+    body = json.dumps({"error": reason}).encode()
+    return (
+        f"HTTP/1.1 {status} {reason}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+    ).encode() + body
+
+
+_NOT_FOUND = _error(404, "Not Found")
+_NOT_ALLOWED = _error(405, "Method Not Allowed")
+_BAD_REQUEST = _error(400, "Bad Request")
+
+
+@functools.lru_cache(maxsize=256)
+def accepts_gzip(accept_encoding):
+    """Whether an Accept-Encoding value allows gzip (q=0 refuses it)."""
+    gzip_q = star_q = None
+    for item in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        coding = coding.lower()
+        if coding in ("gzip", "x-gzip"):
+            gzip_q = q
+        elif coding == "*":
+            star_q = q
+    q = gzip_q if gzip_q is not None else star_q
+    return q is not None and q > 0
+
+
+class Resource:
+    """One pre-framed JSON response in identity and gzip encodings."""
+
+    __slots__ = ("etag", "plain", "gzipped", "not_modified")
+
+    def __init__(self, payload, version):
+        body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = f'"{version}-{hashlib.sha1(body).hexdigest()[:12]}"'
+        head = (
+            "HTTP/1.1 200 OK\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"ETag: {self.etag}\r\n"
+            "Cache-Control: no-cache\r\n"
+            "Vary: Accept-Encoding\r\n"
+        )
+        packed = gzip.compress(body, compresslevel=9, mtime=0)
+        self.plain = f"{head}Content-Length: {len(body)}\r\n\r\n".encode() + body
+        self.gzipped = f"{head}Content-Encoding: gzip\r\nContent-Length: {len(packed)}\r\n\r\n".encode() + packed
+        self.not_modified = f"HTTP/1.1 304 Not Modified\r\nETag: {self.etag}\r\nVary: Accept-Encoding\r\n\r\n".encode()
+
+    def response(self, if_none_match, accept_encoding):
+        if if_none_match and (if_none_match == "*" or self.etag in if_none_match):
+            return self.not_modified
+        return self.gzipped if accepts_gzip(accept_encoding) else self.plain
+
+
+def _journey(catalog, rows):
+    return {
+        "catalog_version": catalog.version,
+        "recommendations": [dataclasses.asdict(r) for r in rows],
+    }
+
+
+class ResponseTable:
+    """All responses for one catalog version."""
+
+    def __init__(self, catalog):
+        self.version = catalog.version
+        self.routes = {
+            "/industries": Resource(list(catalog.industries), catalog.version),
+            "/addons": Resource(catalog.addons, catalog.version),
+            "/healthz": Resource({"status": "ok", "catalog_version": catalog.version}, catalog.version),
+        }
+        self.journeys = {
+            key: Resource(_journey(catalog, rows), catalog.version)
+            for key, rows in catalog.index.journeys.items()
+        }
+        # Industries no product targets get the add-on-only journey, like recommend()
+        self.fallback = Resource(_journey(catalog, catalog.index.addons), catalog.version)
+
+    def resolve(self, path):
+        resource = self.routes.get(path)
+        if resource is not None:
+            return resource
+        if path.startswith(_JOURNEY_PREFIX):
+            key = canonical_industry(unquote(path[len(_JOURNEY_PREFIX):]))
+            return self.journeys.get(key, self.fallback)
+        return None
+
+
+class RecommenderService:
+    def __init__(self, catalog_source=default_catalog):
+        self._catalog_source = catalog_source
+        self._table = ResponseTable(catalog_source())
+
+    def table(self):
+        # The catalog store stats its file at most once a second; rebuild on a new version
+        catalog = self._catalog_source()
+        if catalog.version != self._table.version:
+            self._table = ResponseTable(catalog)
+        return self._table
+
+    def respond(self, method, target, headers):
+        if method not in ("GET", "HEAD"):
+            return _NOT_ALLOWED
+        path = target.split("?", 1)[0]
+        if path == "/metrics":
+            # Live, so never pre-serialized
+            body = render_prometheus().encode("utf-8")
+            return (
+                "HTTP/1.1 200 OK\r\nContent-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n"
+            ).encode() + (body if method == "GET" else b"")
+        resource = self.table().resolve(path)
+        if resource is None:
+            return _NOT_FOUND
+        response = resource.response(headers.get("if-none-match", ""), headers.get("accept-encoding", ""))
+        if method == "HEAD":
+            return response[: response.index(b"\r\n\r\n") + 4]
+        return response
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    writer.write(_BAD_REQUEST)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+
+                # The body is never used, but it must be consumed to find the
+                # next request; anything that cannot be framed safely ends the
+                # connection after the reply
+                keep_alive = True
+                if "transfer-encoding" in headers:
+                    keep_alive = False
+                elif "content-length" in headers:
+                    try:
+                        length = int(headers["content-length"])
+                    except ValueError:
+                        length = -1
+                    if length < 0:
+                        writer.write(_BAD_REQUEST)
+                        break
+                    if length > _MAX_BODY_BYTES:
+                        keep_alive = False
+                    elif length:
+                        try:
+                            await reader.readexactly(length)
+                        except (asyncio.IncompleteReadError, ConnectionError):
+                            break
+
+                writer.write(self.respond(method, target, headers))
+
+                connection = headers.get("connection", "").lower()
+                if not keep_alive or connection == "close" or (version == "HTTP/1.0" and connection != "keep-alive"):
+                    break
+                if writer.transport.get_write_buffer_size() > _DRAIN_ABOVE:
+                    await writer.drain()
+        finally:
+            try:
+                writer.close()
+            except RuntimeError:
+                pass
+
+    async def serve(self, host, port, backlog=4096):
+        server = await asyncio.start_server(self.handle, host, port, limit=_MAX_HEADER_BYTES, backlog=backlog)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Juspay recommendations over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args(argv)
+
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+    service = RecommenderService()
+    print(f"serving catalog {service.table().version} on http://{args.host}:{args.port}")
+    try:
+        if uvloop is not None:
+            uvloop.run(service.serve(args.host, args.port))
+        else:
+            asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Vectorized scoring of catalog entries against merchant feature preferences.
+
+The catalog (products, then add-ons) is encoded once per version as two
+matrices:
+
+    affinity  (industries + 1) x entries   priority weight of each entry per
+                                           industry; the last row is used for
+                                           industries no product targets
+    tags      entries x features           1.0 where an entry carries a tag
+
+A merchant is an industry plus a {feature: weight} preference map, and its
+score vector is  affinity_weight * affinity[industry] + tags @ weights.
+Many merchants are scored with one (m x f) @ (f x n) product, and top-k is
+taken with argpartition, so only the k winners get sorted.
+"""
+import numpy as np
+
+from recommender_core import canonical_industry
+
+# Priority label -> affinity; the label itself still comes from the index
+PRIORITY_WEIGHTS = {
+    "Must Have": 1.0,
+    "Good to Have": 0.5,
+    "✨ Recommended Add-on": 0.3,
+    "Add-on": 0.1,
+}
+
+
+class ScoringModel:
+    __slots__ = ("version", "entries", "industries", "features", "affinity", "tags", "_industry_row", "_feature_col")
+
+    def __init__(self, catalog):
+        self.version = catalog.version
+        self.entries = tuple(catalog.products) + tuple(catalog.addons)
+        entry_col = {name: i for i, name in enumerate(self.entries)}
+        self.industries = tuple(catalog.index.journeys)
+        self._industry_row = {key: i for i, key in enumerate(self.industries)}
+
+        self.affinity = np.zeros((len(self.industries) + 1, len(self.entries)), dtype=np.float32)
+        for key, rows in catalog.index.journeys.items():
+            i = self._industry_row[key]
+            for r in rows:
+                self.affinity[i, entry_col[r.product]] = PRIORITY_WEIGHTS.get(r.priority, 0.0)
+        for r in catalog.index.addons:
+            self.affinity[-1, entry_col[r.product]] = PRIORITY_WEIGHTS.get(r.priority, 0.0)
+
+        details = [catalog.products.get(name) or catalog.addons[name] for name in self.entries]
+        self.features = tuple(sorted({tag for d in details for tag in d.get("features", [])}))
+        self._feature_col = {tag: j for j, tag in enumerate(self.features)}
+        self.tags = np.zeros((len(self.entries), len(self.features)), dtype=np.float32)
+        for i, d in enumerate(details):
+            for tag in d.get("features", []):
+                self.tags[i, self._feature_col[tag]] = 1.0
+
+    def industry_rows(self, industries):
+        """Affinity row index per industry label (unknown labels -> add-on-only row)."""
+        fallback = len(self.industries)
+        return np.fromiter(
+            (self._industry_row.get(canonical_industry(name), fallback) for name in industries),
+            dtype=np.intp,
+            count=len(industries),
+        )
+
+    def preference_matrix(self, preferences):
+        """(m x features) weights from a list of {feature: weight} maps; unknown tags are ignored."""
+        weights = np.zeros((len(preferences), len(self.features)), dtype=np.float32)
+        for i, prefs in enumerate(preferences):
+            for tag, weight in prefs.items():
+                j = self._feature_col.get(tag)
+                if j is not None:
+                    weights[i, j] = weight
+        return weights
+
+    def score_batch(self, industries, weights, affinity_weight=1.0):
+        """(m x entries) scores for m merchants in one matrix product."""
+        scores = weights @ self.tags.T
+        scores += affinity_weight * self.affinity[self.industry_rows(industries)]
+        return scores
+
+    def top_k_batch(self, industries, weights, k=5, affinity_weight=1.0, exclude=None):
+        """(m x k) entry indices and scores, best first.
+
+        exclude is an optional (m x entries) bool matrix of entries a merchant
+        may not get; they score -inf, so they only fill a row that has fewer
+        than k other entries.
+        """
+        scores = self.score_batch(industries, weights, affinity_weight)
+        if exclude is not None:
+            scores[exclude] = -np.inf
+        k = min(k, scores.shape[1])
+        if k < scores.shape[1]:
+            part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            part = np.broadcast_to(np.arange(k), (scores.shape[0], k))
+        part_scores = np.take_along_axis(scores, part, axis=1)
+        order = np.argsort(-part_scores, axis=1, kind="stable")
+        return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
+
+    def top_k(self, industry, preferences=None, k=5, affinity_weight=1.0):
+        """[(entry name, score), ...] for one merchant, best first."""
+        indices, scores = self.top_k_batch([industry], self.preference_matrix([preferences or {}]), k, affinity_weight)
+        return [(self.entries[i], float(s)) for i, s in zip(indices[0], scores[0])]
+
+
+_MODELS = {}
+
+
+def scoring_model(catalog):
+    """ScoringModel for this catalog version (built once per version)."""
+    model = _MODELS.get(catalog.version)
+    if model is None:
+        _MODELS.clear()
+        model = _MODELS[catalog.version] = ScoringModel(catalog)
+    return model
@@ -0,0 +1,206 @@
+"""Full-text and prefix search over catalog products and add-ons.
+
+Every entry's text fields are tokenized into an inverted index whose postings
+carry precomputed BM25 impacts (with per-field weights, so a hit in the name
+or api_calls outranks one in a long description). The vocabulary is kept
+sorted, so a query token is matched as a prefix by bisecting to its range:
+"tokeniz" finds "tokenization", "mandat" finds "mandate". Postings are sorted
+by impact, so a query walks the rarest token's postings best-first, looks the
+other tokens up by document, and stops as soon as no remaining posting can
+enter the top results (MaxScore-style). Common words therefore stay fast when
+the catalog grows by orders of magnitude. A prefix always matches every term
+it starts; one that expands to very many terms ("1", "m") is merged into a
+single postings dict once and cached per prefix.
+
+    index = search_index(catalog)
+    index.search("upi mandate")   # [Hit(record, score, fields), ...]
+
+All query tokens must match (AND). A token's score is its best-matching
+vocabulary term, so a short prefix does not outscore an exact word by
+matching many terms.
+"""
+import heapq
+import math
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+
+from recommender_core import Recommendation
+
+_TOKEN = re.compile(r"[0-9a-z]+")
+
+# Field -> weight in the term frequency (BM25F-style)
+FIELD_WEIGHTS = {
+    "product": 3.0,
+    "api_calls": 2.0,
+    "merchants_using": 2.0,
+    "banks_supported": 1.5,
+    "category": 1.0,
+    "why": 1.0,
+    "api_reason": 1.0,
+    "inter_api_flow": 1.0,
+    "integration": 1.0,
+    "regulation": 1.0,
+    "features": 1.0,
+}
+_FIELD_BIT = {name: 1 << i for i, name in enumerate(FIELD_WEIGHTS)}
+
+K1 = 1.2
+B = 0.75
+# A prefix expanding to more terms than this is searched through one merged
+# postings dict rather than term by term
+MERGE_ABOVE = 64
+# Merged postings kept per index
+MERGED_CACHE = 256
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.casefold())
+
+
+@dataclass(frozen=True, slots=True)
+class Hit:
+    record: Recommendation
+    score: float
+    fields: tuple
+
+
+def _fields(record, details):
+    """(field, text) pairs of one entry; list fields are joined."""
+    for name in FIELD_WEIGHTS:
+        if name == "features":
+            value = details.get("features", ())
+        else:
+            value = getattr(record, name)
+        if isinstance(value, (list, tuple)):
+            value = " ".join(value)
+        if value:
+            yield name, value
+
+
+class SearchIndex:
+    __slots__ = ("version", "records", "vocab", "postings", "_merged")
+
+    def __init__(self, catalog):
+        self.version = catalog.version
+        self.records = catalog.entries()
+
+        # term -> {doc: [weighted tf, field mask]}
+        raw = {}
+        lengths = []
+        for doc, r in enumerate(self.records):
+            details = catalog.products.get(r.product) or catalog.addons.get(r.product, {})
+            length = 0.0
+            for field, text in _fields(r, details):
+                weight, bit = FIELD_WEIGHTS[field], _FIELD_BIT[field]
+                for term in tokenize(text):
+                    entry = raw.setdefault(term, {}).setdefault(doc, [0.0, 0])
+                    entry[0] += weight
+                    entry[1] |= bit
+                    length += weight
+            lengths.append(length)
+
+        n = len(self.records)
+        avg = (sum(lengths) / n) if n else 1.0
+        self.vocab = sorted(raw)
+        # term -> {doc: (impact, field mask)}, best impact first
+        self.postings = {}
+        for term, docs in raw.items():
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            scored = [
+                (doc, (idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * lengths[doc] / avg)), mask))
+                for doc, (tf, mask) in docs.items()
+            ]
+            scored.sort(key=lambda item: (-item[1][0], item[0]))
+            self.postings[term] = dict(scored)
+        self._merged = {}
+
+    def expand(self, prefix):
+        """Vocabulary terms starting with prefix."""
+        lo = bisect_left(self.vocab, prefix)
+        # Tokens are [0-9a-z], so every term with this prefix sorts below prefix + "\uffff"
+        return self.vocab[lo:bisect_left(self.vocab, prefix + "\uffff", lo)]
+
+    def _postings(self, token):
+        """A token's postings dicts: one per matching term, or one merged dict."""
+        terms = self.expand(token)
+        if len(terms) <= MERGE_ABOVE:
+            return [self.postings[t] for t in terms]
+        merged = self._merged.get(token)
+        if merged is None:
+            # Best impact per document (as _best() would pick), field masks combined
+            best = {}
+            for term in terms:
+                for doc, (impact, mask) in self.postings[term].items():
+                    prev = best.get(doc)
+                    best[doc] = (impact, mask) if prev is None else (max(prev[0], impact), prev[1] | mask)
+            merged = dict(sorted(best.items(), key=lambda item: (-item[1][0], item[0])))
+            if len(self._merged) >= MERGED_CACHE:
+                self._merged.pop(next(iter(self._merged)))
+            self._merged[token] = merged
+        return [merged]
+
+    def search(self, query, limit=20):
+        tokens = list(dict.fromkeys(tokenize(query)))
+        groups = [self._postings(token) for token in tokens]
+        if not groups or not all(groups):
+            return []
+        groups.sort(key=lambda lists: sum(map(len, lists)))
+        driver, others = groups[0], groups[1:]
+        # The most the other tokens can add to any document
+        others_max = sum(max(next(iter(p.values()))[0] for p in lists) for lists in others)
+
+        top = []  # min-heap of (score, -doc)
+        seen = set()
+        merged = heapq.merge(*(iter(p.items()) for p in driver), key=lambda item: -item[1][0])
+        for doc, (impact, _) in merged:
+            if len(top) == limit and impact + others_max <= top[0][0]:
+                break
+            if doc in seen:
+                # Already scored with its best term for this token
+                continue
+            seen.add(doc)
+            score = impact
+            for lists in others:
+                best = _best(lists, doc)
+                if not best:
+                    break
+                score += best
+            else:
+                if len(top) < limit:
+                    heapq.heappush(top, (score, -doc))
+                elif (score, -doc) > top[0]:
+                    heapq.heapreplace(top, (score, -doc))
+
+        hits = []
+        for score, neg_doc in sorted(top, reverse=True):
+            mask = 0
+            for lists in groups:
+                for p in lists:
+                    hit = p.get(-neg_doc)
+                    if hit is not None:
+                        mask |= hit[1]
+            hits.append(Hit(self.records[-neg_doc], score, tuple(f for f, bit in _FIELD_BIT.items() if mask & bit)))
+        return hits
+
+
+def _best(lists, doc):
+    """A token's impact for doc: its best-matching term, 0.0 when none matches."""
+    best = 0.0
+    for p in lists:
+        hit = p.get(doc)
+        if hit is not None and hit[0] > best:
+            best = hit[0]
+    return best
+
+
+_INDEXES = {}
+
+
+def search_index(catalog):
+    """SearchIndex for this catalog version (built once per version)."""
+    index = _INDEXES.get(catalog.version)
+    if index is None:
+        _INDEXES.clear()
+        index = _INDEXES[catalog.version] = SearchIndex(catalog)
+    return index
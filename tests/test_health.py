@@ -0,0 +1,64 @@
+import socket
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from health import HealthMonitor  # noqa: E402
+
+
+def test_spellings_of_one_pair_share_a_window():
+    monitor = HealthMonitor()
+    lines = ["1760700000.0,UPI,HDFC Bank,1,800"] * 90 + ["1760700000.5,UPI,HDFC,0,900"] * 10
+    monitor.ingest(lines, now=1760700001.0)
+    snapshot = monitor.snapshot(now=1760700001.0)
+    health = snapshot.bank("UPI", "HDFC")
+    assert health.events == 100
+    assert health.success_rate == 0.9
+    assert snapshot.method("UPI").events == 100
+
+
+def test_quiet_feed_ages_out():
+    monitor = HealthMonitor(window_s=60)
+    monitor.ingest(["1760700000.0,UPI,HDFC,1,800"], now=1760700000.0)
+    assert monitor.snapshot(now=1760700030.0).method("UPI").events == 1
+    # Nothing newer arrived, so the live snapshot (wall clock) is empty
+    assert monitor.snapshot().method("UPI") is None
+
+
+def test_tcp_feed_is_live_before_the_connection_closes():
+    monitor = HealthMonitor()
+    server = monitor.listen("127.0.0.1", 0)
+    try:
+        with socket.create_connection(server.server_address) as conn:
+            conn.sendall(f"{time.time()},UPI,HDFC,1,800\n".encode() * 3)
+            deadline = time.monotonic() + 2.0
+            while monitor.events < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert monitor.events == 3
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_future_dated_event_does_not_hide_current_ones():
+    monitor = HealthMonitor()
+    now = time.time()
+    # A millisecond epoch by mistake
+    monitor.ingest([f"{now * 1000:.0f},UPI,HDFC,1,800"])
+    monitor.ingest([f"{now:.3f},UPI,HDFC,1,800"] * 50)
+    assert monitor.dropped == 1
+    assert monitor.snapshot().method("UPI").events == 50
+
+
+def test_follow_reads_a_file_created_later_from_its_start(tmp_path):
+    path = tmp_path / "events.log"
+    monitor = HealthMonitor()
+    monitor.follow(str(path), poll_s=0.01)
+    time.sleep(0.05)
+    path.write_text(f"{time.time():.3f},UPI,HDFC,1,800\n")
+    deadline = time.monotonic() + 2.0
+    while monitor.events < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert monitor.events == 1
@@ -0,0 +1,440 @@
+"""Profile a merchant's transaction export and recommend from its actual method mix.
+
+    python txn_profile.py export.csv --industry E-Commerce
+    python txn_profile.py export.csv --workers 8 --json
+
+The export is a CSV or Parquet file with one row per payment. Columns are
+matched by name (see COLUMN_ALIASES); only method is required:
+
+    method     UPI, card, NB, ... (folded like the health feed, health.method_key)
+    amount     ticket size in INR
+    success    1/0, true/false or a status such as CHARGED / FAILED
+    bank       issuing bank or network
+    customer   customer id; a customer paying the same amount 3+ times is recurring
+
+The file is read in fixed-size chunks with only those columns, and each chunk
+is reduced to per-method counts, failures and a log-spaced ticket-size
+histogram. Recurring payments are counted exactly per (customer, amount) for
+a hash sample of customers: all of them at first, then 1/2, 1/4, ... whenever
+more than RECURRING_CAPACITY pairs are tracked, so that state is bounded too
+(adaptive sampling; a customer is in or out of the sample as a whole).
+Partial profiles just add up, so with --workers the CSV is split into
+line-aligned byte ranges (Parquet into row groups) and each process
+profiles its own range. Memory stays flat however many rows the export has.
+
+The profile becomes feature preferences for the scoring engine (scoring.py):
+failing UPI boosts recovery (Retry), recurring payments boost subscriptions
+(UPI Autopay), small tickets boost one-click checkout, and so on. Each
+preference comes with the reason it was applied.
+
+Import this module lazily; it pulls in pandas.
+"""
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from health import method_key
+from recommender_core import default_catalog
+
+COLUMN_ALIASES = {
+    "method": ("method", "payment_method", "payment_method_type", "instrument"),
+    "amount": ("amount", "txn_amount", "transaction_amount", "order_amount"),
+    "success": ("success", "status", "txn_status", "is_success"),
+    "bank": ("bank", "issuer", "bank_name", "payment_gateway_bank"),
+    "customer": ("customer", "customer_id", "customer_ref", "user_id"),
+}
+SUCCESS_VALUES = frozenset(("1", "1.0", "true", "t", "y", "yes", "ok", "success", "succeeded", "charged", "captured"))
+
+# Ticket sizes: log-spaced INR bucket edges from 1 to 10 million
+TICKET_EDGES = np.geomspace(1.0, 1e7, 57)
+# Most (customer, amount) pairs tracked for the recurring share; beyond that
+# the customer sample is halved
+RECURRING_CAPACITY = 1 << 16
+RECURRING_MIN = 3
+# Low bits of a pair hash are its customer's hash, so the sample can be
+# narrowed by customer after the fact
+_CUSTOMER_BITS = np.uint64(0xFFFFFFFF)
+
+
+@dataclass
+class MethodStats:
+    transactions: int = 0
+    successes: float = 0.0
+    amount: float = 0.0
+    tickets: np.ndarray = field(default_factory=lambda: np.zeros(len(TICKET_EDGES) + 1, dtype=np.int64))
+
+    def add(self, other):
+        self.transactions += other.transactions
+        self.successes += other.successes
+        self.amount += other.amount
+        self.tickets += other.tickets
+
+
+def _in_sample(pairs, level):
+    """The (pair hash -> payments) entries whose customer is sampled at level."""
+    mask = (1 << level) - 1
+    return {pair: n for pair, n in pairs.items() if not pair & mask}
+
+
+@dataclass
+class Profile:
+    rows: int = 0
+    methods: dict = field(default_factory=dict)  # method key -> MethodStats
+    banks: dict = field(default_factory=dict)  # bank label -> transactions
+    has_success: bool = False
+    has_amount: bool = False
+    recurring: dict = None  # (customer, amount) hash -> payments, sampled customers only
+    recurring_level: int = 0  # customers sampled: those whose hash is 0 mod 2**level
+
+    def merge(self, other):
+        self.rows += other.rows
+        for key, stats in other.methods.items():
+            self.methods.setdefault(key, MethodStats()).add(stats)
+        for bank, n in other.banks.items():
+            self.banks[bank] = self.banks.get(bank, 0) + n
+        self.has_success |= other.has_success
+        self.has_amount |= other.has_amount
+        if other.recurring is not None:
+            level = max(self.recurring_level, other.recurring_level)
+            merged = _in_sample(self.recurring or {}, level)
+            for pair, n in _in_sample(other.recurring, level).items():
+                merged[pair] = merged.get(pair, 0) + n
+            while len(merged) > RECURRING_CAPACITY:
+                level += 1
+                merged = _in_sample(merged, level)
+            self.recurring, self.recurring_level = merged, level
+        return self
+
+    # -------------------------
+    # Derived figures
+    # -------------------------
+    def share(self, method):
+        stats = self.methods.get(method)
+        return stats.transactions / self.rows if stats and self.rows else 0.0
+
+    def _selected(self, method):
+        if method is None:
+            return list(self.methods.values())
+        return [self.methods[method]] if method in self.methods else []
+
+    def failure_rate(self, method=None):
+        if not self.has_success:
+            return None
+        selected = self._selected(method)
+        total = sum(s.transactions for s in selected)
+        return 1 - sum(s.successes for s in selected) / total if total else None
+
+    def ticket_quantiles(self, method=None, qs=(0.5, 0.9)):
+        if not self.has_amount:
+            return None
+        hist = sum((s.tickets for s in self._selected(method)), np.zeros(len(TICKET_EDGES) + 1, dtype=np.int64))
+        total = hist.sum()
+        if not total:
+            return None
+        edges = np.append(TICKET_EDGES, TICKET_EDGES[-1])
+        cumulative = np.cumsum(hist)
+        return tuple(float(edges[np.searchsorted(cumulative, q * total)]) for q in qs)
+
+    def recurring_share(self):
+        # Every payment of a sampled customer is counted under one of its pairs
+        sampled_rows = sum(self.recurring.values()) if self.recurring else 0
+        if not sampled_rows:
+            return None
+        return sum(n for n in self.recurring.values() if n >= RECURRING_MIN) / sampled_rows
+
+    def table(self):
+        """Per-method summary rows, largest share first."""
+        rows = []
+        for key, s in sorted(self.methods.items(), key=lambda item: -item[1].transactions):
+            quantiles = self.ticket_quantiles(key)
+            rows.append({
+                "method": key,
+                "transactions": s.transactions,
+                "share": s.transactions / self.rows if self.rows else 0.0,
+                "failure_rate": (1 - s.successes / s.transactions) if self.has_success and s.transactions else None,
+                "avg_ticket": (s.amount / s.transactions) if self.has_amount and s.transactions else None,
+                "p50_ticket": quantiles[0] if quantiles else None,
+                "p90_ticket": quantiles[1] if quantiles else None,
+            })
+        return rows
+
+    def top_banks(self, n=5):
+        return [bank for bank, _ in sorted(self.banks.items(), key=lambda item: -item[1])[:n]]
+
+
+def _resolve_columns(available):
+    lowered = {name.strip().casefold(): name for name in available}
+    resolved = {}
+    for role, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in lowered:
+                resolved[role] = lowered[alias]
+                break
+    if "method" not in resolved:
+        raise ValueError("the export needs a method column (one of: " + ", ".join(COLUMN_ALIASES["method"]) + ")")
+    return resolved
+
+
+def profile_chunk(df, columns):
+    """Profile of one DataFrame chunk; columns maps roles to column names."""
+    part = Profile(has_success="success" in columns, has_amount="amount" in columns)
+    method = df[columns["method"]].astype("category")
+    # Fold each distinct label once, then work on the integer codes
+    keys = [method_key(str(c)) for c in method.cat.categories]
+    uniq = sorted(set(keys))
+    position = {k: i for i, k in enumerate(uniq)}
+    remap = np.array([position[k] for k in keys], dtype=np.intp)
+    codes = method.cat.codes.to_numpy()
+    valid = codes >= 0
+    group = remap[codes[valid]] if len(remap) else np.zeros(0, dtype=np.intp)
+    n_groups = len(uniq)
+    part.rows = int(valid.sum())
+
+    counts = np.bincount(group, minlength=n_groups)
+    successes = np.zeros(n_groups)
+    if part.has_success:
+        status = df[columns["success"]].astype("category")
+        ok_by_code = np.array([str(c).strip().casefold() in SUCCESS_VALUES for c in status.cat.categories], dtype=bool)
+        status_codes = status.cat.codes.to_numpy()[valid]
+        ok = np.where(status_codes >= 0, ok_by_code[status_codes] if len(ok_by_code) else False, False)
+        successes = np.bincount(group, weights=ok, minlength=n_groups)
+    amounts = np.zeros(n_groups)
+    tickets = np.zeros((n_groups, len(TICKET_EDGES) + 1), dtype=np.int64)
+    if part.has_amount:
+        amount = pd.to_numeric(df[columns["amount"]], errors="coerce").to_numpy(dtype=np.float64)[valid]
+        finite = np.isfinite(amount)
+        amounts = np.bincount(group[finite], weights=amount[finite], minlength=n_groups)
+        bins = np.searchsorted(TICKET_EDGES, amount[finite])
+        flat = np.bincount(group[finite] * tickets.shape[1] + bins, minlength=tickets.size)
+        tickets = flat.reshape(tickets.shape)
+    for i, key in enumerate(uniq):
+        part.methods[key] = MethodStats(int(counts[i]), float(successes[i]), float(amounts[i]), tickets[i])
+
+    if "bank" in columns:
+        part.banks = {str(k): int(v) for k, v in df[columns["bank"]].value_counts(dropna=True).items() if v}
+    if "customer" in columns:
+        customer = df[columns["customer"]].astype(str).to_numpy()[valid]
+        hashed = customer_hash = pd.util.hash_array(customer)
+        if part.has_amount:
+            rounded = np.nan_to_num(np.round(pd.to_numeric(df[columns["amount"]], errors="coerce").to_numpy()[valid]))
+            hashed = hashed ^ pd.util.hash_array(rounded.astype(np.int64))
+        pairs, counts = np.unique((customer_hash & _CUSTOMER_BITS) | (hashed & ~_CUSTOMER_BITS), return_counts=True)
+        level = 0
+        while len(pairs) > RECURRING_CAPACITY:
+            level += 1
+            keep = pairs & np.uint64((1 << level) - 1) == 0
+            pairs, counts = pairs[keep], counts[keep]
+        part.recurring = dict(zip(pairs.tolist(), counts.tolist()))
+        part.recurring_level = level
+    return part
+
+
+class _ByteRange:
+    """Read-only file view ending at a byte offset, for pandas' CSV reader."""
+
+    def __init__(self, handle, end):
+        self.handle = handle
+        self.end = end
+
+    def read(self, size=-1):
+        remaining = self.end - self.handle.tell()
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        return self.handle.read(max(size, 0))
+
+    def __iter__(self):
+        return self
+
+
+def _csv_ranges(path, parts):
+    """Line-aligned (start, end) byte ranges of the CSV body."""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.readline()
+        body = f.tell()
+        cuts = [body]
+        for i in range(1, parts):
+            f.seek(max(body + (size - body) * i // parts, cuts[-1]))
+            f.readline()
+            cuts.append(min(f.tell(), size))
+        cuts.append(size)
+    return [(a, b) for a, b in zip(cuts, cuts[1:]) if b > a]
+
+
+def _header(path):
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def _read_csv(source, columns, chunksize, **options):
+    """Chunked reader over just the profiled columns."""
+    dtypes = {columns[r]: "category" for r in ("method", "success", "bank") if r in columns}
+    if "customer" in columns:
+        dtypes[columns["customer"]] = str
+    return pd.read_csv(source, usecols=sorted(set(columns.values())), dtype=dtypes, chunksize=chunksize, **options)
+
+
+def _profile_csv_range(path, start, end, names, columns, chunksize):
+    profile = Profile()
+    with open(path, "rb") as f:
+        f.seek(start)
+        for chunk in _read_csv(_ByteRange(f, end), columns, chunksize, names=names, header=None):
+            profile.merge(profile_chunk(chunk, columns))
+    return profile
+
+
+def _profile_parquet_groups(source, groups, columns, chunksize):
+    import pyarrow.parquet as pq
+
+    profile = Profile()
+    batches = pq.ParquetFile(source).iter_batches(
+        batch_size=chunksize, row_groups=groups, columns=sorted(set(columns.values()))
+    )
+    for batch in batches:
+        profile.merge(profile_chunk(batch.to_pandas(), columns))
+    return profile
+
+
+def profile_buffer(buffer, name, chunksize=1_000_000):
+    """Profile an open binary export (e.g. a Streamlit upload) in this process."""
+    if name.lower().endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        source = pq.ParquetFile(buffer)
+        columns = _resolve_columns(source.schema_arrow.names)
+        profile = _profile_parquet_groups(buffer, list(range(source.num_row_groups)), columns, chunksize)
+    else:
+        columns = _resolve_columns(pd.read_csv(buffer, nrows=0).columns.tolist())
+        buffer.seek(0)
+        profile = Profile()
+        for chunk in _read_csv(buffer, columns, chunksize):
+            profile.merge(profile_chunk(chunk, columns))
+    profile.has_success = "success" in columns
+    profile.has_amount = "amount" in columns
+    return profile
+
+
+def profile_file(path, workers=1, chunksize=1_000_000):
+    """Profile a .csv or .parquet export in bounded memory, optionally across processes."""
+    path = Path(path)
+    parquet = path.suffix.lower() == ".parquet"
+    if parquet:
+        import pyarrow.parquet as pq
+
+        source = pq.ParquetFile(path)
+        columns = _resolve_columns(source.schema_arrow.names)
+        groups = list(range(source.num_row_groups))
+        jobs = [(_profile_parquet_groups, path, groups[i::workers], columns, chunksize) for i in range(min(workers, len(groups)) or 1)]
+    else:
+        names = _header(path)
+        columns = _resolve_columns(names)
+        jobs = [(_profile_csv_range, path, a, b, names, columns, chunksize) for a, b in _csv_ranges(path, max(workers, 1))]
+
+    profile = Profile(has_success="success" in columns, has_amount="amount" in columns)
+    if workers <= 1 or len(jobs) <= 1:
+        for fn, *args in jobs:
+            profile.merge(fn(*args))
+        return profile
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(_call, jobs):
+            profile.merge(part)
+    return profile
+
+
+def _call(job):
+    fn, *args = job
+    return fn(*args)
+
+
+def preferences(profile):
+    """({feature: weight}, [reason, ...]) for scoring.py from a merchant profile."""
+    prefs, reasons = {}, []
+
+    def boost(tags, weight, reason):
+        if weight <= 0:
+            return
+        for tag in tags:
+            prefs[tag] = max(prefs.get(tag, 0.0), round(min(weight, 1.0), 3))
+        reasons.append(reason)
+
+    upi_share = profile.share("upi")
+    card_share = profile.share("cardswithtokenization")
+    nb_share = profile.share("netbanking")
+    boost(("upi", "instant"), upi_share * 1.5, f"UPI is {upi_share:.0%} of transactions")
+    boost(("cards", "secure"), card_share * 1.5, f"cards are {card_share:.0%} of transactions")
+    boost(("bank-direct",), nb_share * 1.5, f"netbanking is {nb_share:.0%} of transactions")
+
+    upi_failures = profile.failure_rate("upi")
+    if upi_failures is not None and upi_share and upi_failures > 0.03:
+        boost(("recovery", "reliability"), upi_failures * 10, f"UPI fails {upi_failures:.1%} of the time")
+    overall = profile.failure_rate()
+    if overall is not None and overall > 0.05:
+        boost(("reliability", "routing"), overall * 8, f"{overall:.1%} of all payments fail")
+
+    recurring = profile.recurring_share()
+    if recurring is not None and recurring > 0.05:
+        boost(("recurring", "subscriptions"), recurring * 3, f"{recurring:.0%} of payments repeat the same amount per customer")
+
+    tickets = profile.ticket_quantiles()
+    if tickets is not None:
+        median, p90 = tickets
+        if median <= 500:
+            boost(("one-click", "checkout-ux", "conversion"), 0.6, f"half the tickets are under ₹{median:,.0f}")
+        if p90 >= 20_000:
+            boost(("control", "risk"), 0.5, f"the top 10% of tickets exceed ₹{p90:,.0f}")
+    return prefs, reasons
+
+
+def recommend_from_profile(profile, industry="", k=8, catalog=None):
+    """[(record, score), ...] best first, plus the reasons behind the preferences."""
+    from scoring import scoring_model
+
+    catalog = catalog or default_catalog()
+    prefs, reasons = preferences(profile)
+    records = {r.product: r for r in catalog.entries()}
+    # Keep the industry's priority labels where the journey has them
+    records.update({r.product: r for r in catalog.recommend(industry)} if industry else {})
+    ranked = scoring_model(catalog).top_k(industry, prefs, k)
+    return [(records[name], score) for name, score in ranked], reasons
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile a transaction export and recommend Juspay products.")
+    parser.add_argument("input", help=".csv or .parquet export")
+    parser.add_argument("--industry", default="", help="optional business category to blend in")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000, help="rows per chunk")
+    parser.add_argument("--top-k", type=int, default=8)
+    parser.add_argument("--json", action="store_true", help="print the profile and recommendations as JSON")
+    args = parser.parse_args(argv)
+
+    profile = profile_file(args.input, args.workers, args.chunk_size)
+    ranked, reasons = recommend_from_profile(profile, args.industry, args.top_k)
+    if args.json:
+        print(json.dumps({
+            "rows": profile.rows,
+            "methods": profile.table(),
+            "recurring_share": profile.recurring_share(),
+            "top_banks": profile.top_banks(),
+            "reasons": reasons,
+            "recommendations": [{"product": r.product, "priority": r.priority, "score": round(s, 4)} for r, s in ranked],
+        }, indent=1, ensure_ascii=False))
+        return
+    print(f"{profile.rows:,} transactions")
+    for row in profile.table():
+        failure = "-" if row["failure_rate"] is None else f"{row['failure_rate']:.1%}"
+        p50 = "-" if row["p50_ticket"] is None else f"{row['p50_ticket']:,.0f}"
+        print(f"  {row['method']:<24} {row['share']:>7.1%}  fail {failure:>6}  p50 ticket {p50:>8}")
+    for reason in reasons:
+        print(f"  · {reason}")
+    for r, score in ranked:
+        print(f"{score:6.2f}  {r.product} ({r.priority})")
+
+
+if __name__ == "__main__":
+    main()
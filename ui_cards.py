@@ -0,0 +1,180 @@
+"""Batched, paged rendering of recommendation cards for the Streamlit apps.
+
+Each card is composed into one markdown payload (one delta) instead of one
+st.markdown call per field. Only the current page of cards is rendered, and
+collapsed cards send just their title: the body is only sent after the user
+opens that card.
+
+render_recommendations() shows an industry's journey, re-ranked by live
+payment health when RECOMMENDER_HEALTH_FEED is set (health.py).
+render_search() puts a search box over the whole catalog (search.py) and
+shows the hits with the same paged cards. render_profile_upload() does the same
+for recommendations grounded in an uploaded transaction export (txn_profile.py).
+"""
+import functools
+import os
+
+import streamlit as st
+
+from metrics import RENDER_SECONDS, STAGE_SECONDS
+from recommender_core import canonical_industry
+from search import search_index
+
+PAGE_SIZE = 10
+
+
+@functools.lru_cache(maxsize=1024)
+def card_markdown(r):
+    """The card body as a single markdown string (records are immutable, so cache it)."""
+    parts = [f"**📂 Category:** {r.category}", f"**💡 Why it matters:** {r.why}"]
+    if r.api_calls:
+        parts.append(f"**🔌 API Calls involved:** {', '.join(r.api_calls)}")
+    if r.api_reason:
+        parts.append(f"**🗣 In simple words:** {r.api_reason}")
+    if r.inter_api_flow:
+        parts.append(f"**🔄 Inter-API Communication:** {r.inter_api_flow}")
+    if r.banks_supported:
+        parts.append(f"**🏦 Supported Banks/Networks:** {', '.join(r.banks_supported)}")
+    if r.integration:
+        parts.append(f"**⚙️ Integration Steps:** {r.integration}")
+    if r.regulation:
+        parts.append(f"**📜 Regulatory note (RBI):** {r.regulation}")
+    if r.demo_video:
+        parts.append(f"**🎥 Demo Video:** [Watch here]({r.demo_video})")
+    if r.merchants_using:
+        parts.append(f"**🤝 Who’s already using this:** {', '.join(r.merchants_using)}")
+    return "\n\n".join(parts)
+
+
+def _toggle(opened, product):
+    opened.symmetric_difference_update({product})
+
+
+def _turn(state_key, step):
+    st.session_state[state_key] += step
+
+
+def render_journey(recs, key="journey", page_size=PAGE_SIZE, industry=""):
+    """Render one page of cards; page and opened cards live in session state under key."""
+    with STAGE_SECONDS.time("render"), RENDER_SECONDS.time(canonical_industry(industry) or "other"):
+        _render_page(recs, key, page_size)
+
+
+def _render_page(recs, key, page_size):
+    # Order-insensitive: live health re-ranking reorders a journey, it is not a
+    # new one. Priorities are part of it, so a re-tiered journey resets.
+    signature = frozenset((r.product, r.priority) for r in recs)
+    if st.session_state.get(f"{key}_sig") != signature:
+        # A new journey starts on page one with its default cards open
+        st.session_state[f"{key}_sig"] = signature
+        st.session_state[f"{key}_page"] = 0
+        st.session_state[f"{key}_open"] = {r.product for r in recs if r.expanded}
+    opened = st.session_state[f"{key}_open"]
+    pages = max(1, -(-len(recs) // page_size))
+    page = min(st.session_state[f"{key}_page"], pages - 1)
+
+    for r in recs[page * page_size:(page + 1) * page_size]:
+        with st.container(border=True):
+            title, toggle = st.columns([6, 1], vertical_alignment="center")
+            title.markdown(f"**📦 {r.product}** ({r.priority})")
+            is_open = r.product in opened
+            toggle.button(
+                "Hide" if is_open else "Details",
+                key=f"{key}_toggle_{r.product}",
+                on_click=_toggle,
+                args=(opened, r.product),
+            )
+            if is_open:
+                st.markdown(card_markdown(r))
+
+    if pages > 1:
+        prev, label, nxt = st.columns([1, 4, 1], vertical_alignment="center")
+        prev.button("◀ Prev", key=f"{key}_prev", disabled=page == 0, on_click=_turn, args=(f"{key}_page", -1))
+        label.caption(f"Page {page + 1} of {pages} · {len(recs)} cards")
+        nxt.button("Next ▶", key=f"{key}_next", disabled=page == pages - 1, on_click=_turn, args=(f"{key}_page", 1))
+
+
+def _health_monitor():
+    # Live health re-ranking is opt-in; health.py pulls in NumPy
+    if not os.environ.get("RECOMMENDER_HEALTH_FEED"):
+        return None
+    import health
+
+    return health.monitor_from_env()
+
+
+def render_recommendations(catalog, industry, banks, key="journey"):
+    """The journey for industry and banks, health re-ranked when a feed is configured."""
+    recs = catalog.recommend(industry, banks=banks)
+    monitor = _health_monitor()
+    if monitor is not None:
+        recs = monitor.rerank(recs, catalog.products)
+        live = monitor.snapshot().describe(r.product for r in recs if r.product in catalog.products)
+        if live:
+            st.caption("📡 Live health (last minute): " + " · ".join(live))
+    if banks and not any(r.product in catalog.products for r in recs):
+        st.warning(f"No payment product supports all of {', '.join(banks)}; showing add-ons only.")
+    if not recs:
+        st.error("No matching Juspay products found for your selection.")
+    else:
+        render_journey(recs, key=key, industry=industry)
+
+
+def render_search(catalog, key="search"):
+    """Search box over every product and add-on; hits render as paged cards under key."""
+    query = st.text_input(
+        "🔎 Search products and add-ons:",
+        key=f"{key}_query",
+        placeholder="e.g. mandate, tokeniz, Netflix, NPCI",
+    )
+    if not query.strip():
+        return
+    with STAGE_SECONDS.time("search"):
+        hits = search_index(catalog).search(query)
+    if not hits:
+        st.info(f"Nothing in the catalog matches “{query}”.")
+        return
+    st.caption(f"{len(hits)} match(es) · " + " · ".join(f"{h.record.product} ({', '.join(h.fields)})" for h in hits[:5]))
+    render_journey([h.record for h in hits], key=key)
+
+
+def render_profile_upload(catalog, key="profile"):
+    """Uploader for a transaction export; its profile and recommendations render under key."""
+    uploaded = st.file_uploader(
+        "📂 Or upload a transaction export (CSV/Parquet) to recommend from your actual payments:",
+        type=["csv", "parquet"],
+        key=f"{key}_file",
+    )
+    if uploaded is None:
+        return
+    state = st.session_state.get(f"{key}_result")
+    if state is None or state[0] != (uploaded.file_id, catalog.version):
+        # pandas is only needed once a file is uploaded
+        import txn_profile
+
+        try:
+            with STAGE_SECONDS.time("dataframe"), st.spinner("Profiling transactions…"):
+                profile = txn_profile.profile_buffer(uploaded, uploaded.name)
+        except ValueError as exc:
+            st.error(f"Could not read {uploaded.name}: {exc}")
+            return
+        ranked, reasons = txn_profile.recommend_from_profile(profile, catalog=catalog)
+        state = st.session_state[f"{key}_result"] = (
+            (uploaded.file_id, catalog.version),
+            profile.rows,
+            profile.table(),
+            reasons,
+            tuple(r for r, _ in ranked),
+        )
+    _, rows, table, reasons, recs = state
+    st.caption(f"{rows:,} transactions profiled")
+    st.dataframe(
+        table,
+        column_config={
+            "share": st.column_config.NumberColumn(format="percent"),
+            "failure_rate": st.column_config.NumberColumn(format="percent"),
+        },
+    )
+    if reasons:
+        st.markdown("**Why these:** " + "; ".join(reasons) + ".")
+    render_journey(recs, key=key)